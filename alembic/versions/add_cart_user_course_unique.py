@@ -0,0 +1,32 @@
+"""Add unique constraint on carts (user_id, course_id)
+
+Revision ID: cart_user_course_unique
+Revises: learner_attempt_lz4
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cart_user_course_unique'
+down_revision = 'learner_attempt_lz4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest row of any duplicates left by concurrent add-to-cart requests
+    op.execute(
+        "DELETE FROM carts WHERE id NOT IN "
+        "(SELECT min(id) FROM carts GROUP BY user_id, course_id)"
+    )
+    # Add-to-cart inserts with ON CONFLICT (user_id, course_id) DO NOTHING
+    with op.batch_alter_table('carts') as batch_op:
+        batch_op.create_unique_constraint('uq_cart_user_course', ['user_id', 'course_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('carts') as batch_op:
+        batch_op.drop_constraint('uq_cart_user_course', type_='unique')
@@ -0,0 +1,48 @@
+"""Add composite indexes for payment, wishlist, learner attempt and log lookups
+
+Revision ID: add_composite_lookup_indexes
+Revises: coupon_server_timestamps
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_composite_lookup_indexes'
+down_revision = 'coupon_server_timestamps'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Payments by user/course filtered on status
+    op.create_index('ix_payment_user_status', 'payments', ['user_id', 'status'])
+    op.create_index('ix_payment_course_status', 'payments', ['course_id', 'status'])
+
+    # Keep the oldest row of any duplicate wishlist entries, then allow one per user and course;
+    # the leading user_id serves wishlist listings
+    op.execute(
+        "DELETE FROM wishlists WHERE id NOT IN "
+        "(SELECT min(id) FROM wishlists GROUP BY user_id, course_id)"
+    )
+    with op.batch_alter_table('wishlists') as batch_op:
+        batch_op.create_unique_constraint('uq_wishlist_user_course', ['user_id', 'course_id'])
+
+    # Attempts belonging to an enrollment
+    op.create_index('ix_learner_attempt_enrollment', 'learner_attempts', ['enrollment_id'])
+
+    # Level filter with date range; replaces the single-column level index
+    op.create_index('ix_logs_level_created', 'logs', ['level', 'created_at'])
+    op.drop_index('ix_logs_level', table_name='logs')
+
+
+def downgrade():
+    op.create_index('ix_logs_level', 'logs', ['level'])
+    op.drop_index('ix_logs_level_created', table_name='logs')
+    op.drop_index('ix_learner_attempt_enrollment', table_name='learner_attempts')
+    with op.batch_alter_table('wishlists') as batch_op:
+        batch_op.drop_constraint('uq_wishlist_user_course', type_='unique')
+    op.drop_index('ix_payment_course_status', table_name='payments')
+    op.drop_index('ix_payment_user_status', table_name='payments')
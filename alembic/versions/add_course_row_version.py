@@ -0,0 +1,25 @@
+"""Add a row version counter to courses
+
+Revision ID: course_row_version
+Revises: add_search_trigram_indexes
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'course_row_version'
+down_revision = 'add_search_trigram_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Incremented by every UPDATE; keys the cached course list entries
+    op.add_column('courses', sa.Column('row_version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    op.drop_column('courses', 'row_version')
@@ -0,0 +1,33 @@
+"""Add payment_id to enrollments for idempotent webhook fulfilment
+
+Revision ID: add_enrollment_payment_id
+Revises: add_partial_indexes
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_enrollment_payment_id'
+down_revision = 'add_partial_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable: manual and free enrollments have no payment
+    with op.batch_alter_table('enrollments') as batch_op:
+        batch_op.add_column(sa.Column('payment_id', sa.Integer(), nullable=True))
+        batch_op.create_unique_constraint('uq_enrollment_payment_id', ['payment_id'])
+        batch_op.create_foreign_key(
+            'fk_enrollments_payment_id', 'payments', ['payment_id'], ['id']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('enrollments') as batch_op:
+        batch_op.drop_constraint('fk_enrollments_payment_id', type_='foreignkey')
+        batch_op.drop_constraint('uq_enrollment_payment_id', type_='unique')
+        batch_op.drop_column('payment_id')
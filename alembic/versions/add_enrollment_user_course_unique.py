@@ -0,0 +1,41 @@
+"""Add unique constraint on enrollments (user_id, course_id)
+
+Revision ID: enrollment_user_course_unique
+Revises: add_cloudflare_stream
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'enrollment_user_course_unique'
+down_revision = 'add_cloudflare_stream'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest row of any duplicates left by repeated webhook deliveries;
+    # attempts recorded against a duplicate move to the kept enrollment first
+    op.execute(
+        "UPDATE learner_attempts SET enrollment_id = "
+        "(SELECT min(e2.id) FROM enrollments e1 JOIN enrollments e2 "
+        "ON e2.user_id = e1.user_id AND e2.course_id = e1.course_id "
+        "WHERE e1.id = learner_attempts.enrollment_id) "
+        "WHERE enrollment_id NOT IN "
+        "(SELECT min(id) FROM enrollments GROUP BY user_id, course_id)"
+    )
+    op.execute(
+        "DELETE FROM enrollments WHERE id NOT IN "
+        "(SELECT min(id) FROM enrollments GROUP BY user_id, course_id)"
+    )
+    # One enrollment per user and course, so repeated webhook deliveries can't duplicate rows
+    with op.batch_alter_table('enrollments') as batch_op:
+        batch_op.create_unique_constraint('uq_enrollment_user_course', ['user_id', 'course_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('enrollments') as batch_op:
+        batch_op.drop_constraint('uq_enrollment_user_course', type_='unique')
@@ -0,0 +1,35 @@
+"""Add composite indexes for learner attempt lookups
+
+Revision ID: add_learner_attempt_indexes
+Revises: add_enrollment_payment_id
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_learner_attempt_indexes'
+down_revision = 'add_enrollment_payment_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Latest attempt per user/SCO (course progress, attempt history)
+    op.create_index(
+        'ix_learner_attempt_user_sco_num', 'learner_attempts',
+        ['user_id', 'sco_id', 'attempt_number']
+    )
+    
+    # Resumable attempt lookup in POST /scorm/initialize/{sco_id}
+    op.create_index(
+        'ix_learner_attempt_user_sco_status', 'learner_attempts',
+        ['user_id', 'sco_id', 'completion_status']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_learner_attempt_user_sco_status', table_name='learner_attempts')
+    op.drop_index('ix_learner_attempt_user_sco_num', table_name='learner_attempts')
@@ -0,0 +1,28 @@
+"""Add a staged-values flag to learner attempts
+
+Revision ID: learner_attempt_staged_flag
+Revises: course_row_version
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'learner_attempt_staged_flag'
+down_revision = 'course_row_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Set while SetValue calls are staged in Redis and not yet committed
+    op.add_column(
+        'learner_attempts',
+        sa.Column('has_staged_values', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+
+
+def downgrade():
+    op.drop_column('learner_attempts', 'has_staged_values')
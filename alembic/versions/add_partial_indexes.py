@@ -0,0 +1,29 @@
+"""Add partial index for active enrollments
+
+Revision ID: add_partial_indexes
+Revises: add_payment_status_index
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_partial_indexes'
+down_revision = 'add_payment_status_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Only active enrollments are indexed; used by GET /enrollments/my-courses
+    op.create_index(
+        'ix_enrollments_active_by_user', 'enrollments', ['user_id'],
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_enrollments_active_by_user', table_name='enrollments')
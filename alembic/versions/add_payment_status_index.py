@@ -0,0 +1,25 @@
+"""Add index on payments.status
+
+Revision ID: add_payment_status_index
+Revises: enrollment_user_course_unique
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_payment_status_index'
+down_revision = 'enrollment_user_course_unique'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Payment stats and revenue queries group/filter by status
+    op.create_index('ix_payments_status', 'payments', ['status'])
+
+
+def downgrade():
+    op.drop_index('ix_payments_status', table_name='payments')
@@ -0,0 +1,46 @@
+"""Add trigram GIN indexes for course and blog search
+
+Revision ID: add_search_trigram_indexes
+Revises: course_tree_on_delete_cascade
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_trigram_indexes'
+down_revision = 'course_tree_on_delete_cascade'
+branch_labels = None
+depends_on = None
+
+# (index, table, column) searched with ILIKE '%term%'
+INDEXES = [
+    ('ix_courses_title_trgm', 'courses', 'title'),
+    ('ix_courses_description_trgm', 'courses', 'description'),
+    ('ix_blogs_title_trgm', 'blogs', 'title'),
+    ('ix_blogs_excerpt_trgm', 'blogs', 'excerpt'),
+]
+
+
+def upgrade():
+    # Leading-wildcard LIKE cannot use a B-tree; SQLite keeps scanning
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # The extension is left installed; other objects may depend on it
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,45 @@
+"""Stamp coupon timestamps on the database server
+
+Revision ID: coupon_server_timestamps
+Revises: partition_api_analytics
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'coupon_server_timestamps'
+down_revision = 'partition_api_analytics'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('coupons') as batch_op:
+        # Existing naive values were written with datetime.utcnow()
+        for column in ('created_at', 'updated_at'):
+            batch_op.alter_column(
+                column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                server_default=sa.func.now(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
+        batch_op.alter_column(
+            'valid_from', existing_type=sa.DateTime(), server_default=sa.func.now()
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('coupons') as batch_op:
+        batch_op.alter_column('valid_from', existing_type=sa.DateTime(), server_default=None)
+        for column in ('updated_at', 'created_at'):
+            batch_op.alter_column(
+                column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                server_default=None,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
@@ -0,0 +1,54 @@
+"""Cascade course content deletes in the database
+
+Revision ID: course_tree_on_delete_cascade
+Revises: wishlist_cart_server_timestamps
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'course_tree_on_delete_cascade'
+down_revision = 'wishlist_cart_server_timestamps'
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table, ON DELETE action)
+FOREIGN_KEYS = [
+    ('enrollments', 'course_id', 'courses', 'CASCADE'),
+    ('sections', 'course_id', 'courses', 'CASCADE'),
+    ('lessons', 'course_id', 'courses', 'CASCADE'),
+    ('lessons', 'section_id', 'sections', 'CASCADE'),
+    ('lessons', 'sco_id', 'scos', 'SET NULL'),
+    ('scos', 'course_id', 'courses', 'CASCADE'),
+    ('quizzes', 'lesson_id', 'lessons', 'CASCADE'),
+    ('quiz_questions', 'quiz_id', 'quizzes', 'CASCADE'),
+    ('quiz_attempts', 'quiz_id', 'quizzes', 'CASCADE'),
+    ('learner_attempts', 'sco_id', 'scos', 'CASCADE'),
+    ('learner_attempts', 'enrollment_id', 'enrollments', 'CASCADE'),
+]
+
+
+def _recreate_foreign_keys(with_action: bool):
+    # SQLite cannot alter constraints in place; fresh SQLite databases get them from the models
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, referenced, action in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name, table, referenced, [column], ['id'],
+            ondelete=action if with_action else None
+        )
+
+
+def upgrade():
+    # Deleting a course, section, lesson or quiz removes its descendants in one
+    # statement instead of the ORM loading and deleting every child row
+    _recreate_foreign_keys(with_action=True)
+
+
+def downgrade():
+    _recreate_foreign_keys(with_action=False)
@@ -0,0 +1,47 @@
+"""Use a BRIN index for logs.created_at and tighten BRIN ranges
+
+Revision ID: created_at_brin_indexes
+Revises: partition_logs
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'created_at_brin_indexes'
+down_revision = 'partition_logs'
+branch_labels = None
+depends_on = None
+
+# Smaller block ranges than the default 128 pages give tighter pruning
+PAGES_PER_RANGE = 32
+
+
+def upgrade():
+    # logs.created_at: B-tree replaced by BRIN (a plain index on SQLite)
+    op.drop_index('ix_logs_created_at', table_name='logs')
+    op.create_index(
+        'ix_logs_created_at_brin', 'logs', ['created_at'],
+        postgresql_using='brin', postgresql_with={'pages_per_range': PAGES_PER_RANGE}
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('idx_api_analytics_created_at_brin', table_name='api_analytics')
+        op.create_index(
+            'idx_api_analytics_created_at_brin', 'api_analytics', ['created_at'],
+            postgresql_using='brin', postgresql_with={'pages_per_range': PAGES_PER_RANGE}
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('idx_api_analytics_created_at_brin', table_name='api_analytics')
+        op.create_index(
+            'idx_api_analytics_created_at_brin', 'api_analytics', ['created_at'],
+            postgresql_using='brin'
+        )
+
+    op.drop_index('ix_logs_created_at_brin', table_name='logs')
+    op.create_index('ix_logs_created_at', 'logs', ['created_at'])
@@ -0,0 +1,32 @@
+"""Drop single-column api_analytics indexes covered by composite indexes
+
+Revision ID: drop_analytics_single_indexes
+Revises: add_learner_attempt_indexes
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'drop_analytics_single_indexes'
+down_revision = 'add_learner_attempt_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Leading columns of idx_endpoint_method, idx_status_created and
+    # idx_created_at_endpoint; method is only grouped on, never filtered
+    op.drop_index('ix_api_analytics_endpoint', table_name='api_analytics')
+    op.drop_index('ix_api_analytics_method', table_name='api_analytics')
+    op.drop_index('ix_api_analytics_status_code', table_name='api_analytics')
+    op.drop_index('ix_api_analytics_created_at', table_name='api_analytics')
+
+
+def downgrade():
+    op.create_index('ix_api_analytics_created_at', 'api_analytics', ['created_at'])
+    op.create_index('ix_api_analytics_status_code', 'api_analytics', ['status_code'])
+    op.create_index('ix_api_analytics_method', 'api_analytics', ['method'])
+    op.create_index('ix_api_analytics_endpoint', 'api_analytics', ['endpoint'])
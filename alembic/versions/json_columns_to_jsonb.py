@@ -0,0 +1,46 @@
+"""Store course, quiz and learner attempt JSON columns as JSONB (PostgreSQL)
+
+Revision ID: json_columns_to_jsonb
+Revises: add_composite_lookup_indexes
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'json_columns_to_jsonb'
+down_revision = 'add_composite_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+COLUMNS = {
+    'courses': ['sequencing_rules', 'navigation_controls', 'completion_criteria', 'success_criteria'],
+    'quiz_questions': ['options', 'correct_answer'],
+    'quiz_attempts': ['answers'],
+    'learner_attempts': ['interactions', 'objectives', 'comments_from_learner', 'comments_from_lms'],
+}
+
+
+def _convert(type_, cast: str):
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column, type_=type_,
+                postgresql_using=f'{column}::{cast}'
+            )
+
+
+def upgrade():
+    # SQLite has a single JSON storage type; nothing to change there
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    _convert(postgresql.JSONB(), 'jsonb')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    _convert(sa.JSON(), 'json')
@@ -0,0 +1,38 @@
+"""Compress large learner attempt columns with LZ4 (PostgreSQL 14+)
+
+Revision ID: learner_attempt_lz4
+Revises: created_at_brin_indexes
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'learner_attempt_lz4'
+down_revision = 'created_at_brin_indexes'
+branch_labels = None
+depends_on = None
+
+# Values above ~2KB are TOAST-compressed; LZ4 decompresses several times faster than pglz
+COLUMNS = ['suspend_data', 'interactions', 'objectives']
+
+
+def _set_compression(method: str):
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    if int(bind.execute(sa.text("SHOW server_version_num")).scalar()) < 140000:
+        return  # Per-column compression needs PostgreSQL 14
+    for column in COLUMNS:
+        op.execute(f"ALTER TABLE learner_attempts ALTER COLUMN {column} SET COMPRESSION {method}")
+
+
+def upgrade():
+    # Applies to newly written values; existing values keep pglz until rewritten
+    _set_compression('lz4')
+
+
+def downgrade():
+    _set_compression('pglz')
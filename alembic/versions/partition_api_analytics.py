@@ -0,0 +1,105 @@
+"""Partition api_analytics by month on created_at (PostgreSQL)
+
+Revision ID: partition_api_analytics
+Revises: drop_analytics_single_indexes
+Create Date: 2026-10-15
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_api_analytics'
+down_revision = 'drop_analytics_single_indexes'
+branch_labels = None
+depends_on = None
+
+# Partitions created ahead of the current month (the app also creates them on startup)
+MONTHS_AHEAD = 3
+
+# Secondary indexes recreated on the new table (the created_at composite becomes BRIN)
+INDEXES = [
+    ('ix_api_analytics_id', ['id']),
+    ('ix_api_analytics_user_id', ['user_id']),
+    ('ix_api_analytics_ip_address', ['ip_address']),
+    ('ix_api_analytics_country', ['country']),
+    ('idx_endpoint_method', ['endpoint', 'method']),
+    ('idx_status_created', ['status_code', 'created_at']),
+]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _copy_table(source: str, target: str):
+    op.execute(f"INSERT INTO {target} SELECT * FROM {source}")
+    op.execute(f"ALTER SEQUENCE api_analytics_id_seq OWNED BY {target}.id")
+    op.execute(f"DROP TABLE {source}")
+
+
+def _create_indexes():
+    for name, columns in INDEXES:
+        op.create_index(name, 'api_analytics', columns)
+    # BRIN suits an append-only, time-ordered column and is far smaller than a B-tree
+    op.create_index(
+        'idx_api_analytics_created_at_brin', 'api_analytics', ['created_at'],
+        postgresql_using='brin'
+    )
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        # No partitioning on SQLite; just swap the created_at composite for a plain index
+        op.drop_index('idx_created_at_endpoint', table_name='api_analytics')
+        op.create_index('idx_api_analytics_created_at_brin', 'api_analytics', ['created_at'])
+        return
+
+    op.execute("ALTER TABLE api_analytics RENAME TO api_analytics_unpartitioned")
+    op.execute(
+        "CREATE TABLE api_analytics (LIKE api_analytics_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    # Monthly partitions from the oldest existing row through MONTHS_AHEAD;
+    # anything outside them lands in the default partition
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(created_at) FROM api_analytics_unpartitioned")
+    ).scalar()
+    this_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else this_month
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE api_analytics_{month:%Y_%m} PARTITION OF api_analytics "
+            f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE api_analytics_default PARTITION OF api_analytics DEFAULT")
+
+    # Constraint and index names are freed once the old table is dropped;
+    # the partition key must be part of the primary key
+    _copy_table('api_analytics_unpartitioned', 'api_analytics')
+    op.execute("ALTER TABLE api_analytics ADD PRIMARY KEY (id, created_at)")
+    _create_indexes()
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.drop_index('idx_api_analytics_created_at_brin', table_name='api_analytics')
+        op.create_index('idx_created_at_endpoint', 'api_analytics', ['created_at', 'endpoint'])
+        return
+
+    op.execute("ALTER TABLE api_analytics RENAME TO api_analytics_partitioned")
+    op.execute(
+        "CREATE TABLE api_analytics (LIKE api_analytics_partitioned INCLUDING DEFAULTS)"
+    )
+
+    # Dropping the partitioned table drops all of its partitions
+    _copy_table('api_analytics_partitioned', 'api_analytics')
+    op.execute("ALTER TABLE api_analytics ADD PRIMARY KEY (id)")
+    for name, columns in INDEXES:
+        op.create_index(name, 'api_analytics', columns)
+    op.create_index('idx_created_at_endpoint', 'api_analytics', ['created_at', 'endpoint'])
@@ -0,0 +1,91 @@
+"""Partition logs by month on created_at (PostgreSQL)
+
+Revision ID: partition_logs
+Revises: json_columns_to_jsonb
+Create Date: 2026-10-15
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_logs'
+down_revision = 'json_columns_to_jsonb'
+branch_labels = None
+depends_on = None
+
+# Partitions created ahead of the current month (the app also creates them on startup)
+MONTHS_AHEAD = 3
+
+# Indexes recreated on the new table
+INDEXES = [
+    ('ix_logs_id', ['id']),
+    ('ix_logs_user_id', ['user_id']),
+    ('ix_logs_created_at', ['created_at']),
+    ('ix_logs_level_created', ['level', 'created_at']),
+]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _copy_table(source: str, target: str):
+    op.execute(f"INSERT INTO {target} SELECT * FROM {source}")
+    op.execute(f"ALTER SEQUENCE logs_id_seq OWNED BY {target}.id")
+    op.execute(f"DROP TABLE {source}")
+
+
+def _create_indexes():
+    for name, columns in INDEXES:
+        op.create_index(name, 'logs', columns)
+    op.create_foreign_key('logs_user_id_fkey', 'logs', 'users', ['user_id'], ['id'])
+
+
+def upgrade():
+    # SQLite has no declarative partitioning
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE logs RENAME TO logs_unpartitioned")
+    op.execute(
+        "CREATE TABLE logs (LIKE logs_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    # Monthly partitions from the oldest existing row through MONTHS_AHEAD;
+    # anything outside them lands in the default partition
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(created_at) FROM logs_unpartitioned")
+    ).scalar()
+    this_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else this_month
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE logs_{month:%Y_%m} PARTITION OF logs "
+            f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE logs_default PARTITION OF logs DEFAULT")
+
+    # Constraint and index names are freed once the old table is dropped;
+    # the partition key must be part of the primary key
+    _copy_table('logs_unpartitioned', 'logs')
+    op.execute("ALTER TABLE logs ADD PRIMARY KEY (id, created_at)")
+    _create_indexes()
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE logs RENAME TO logs_partitioned")
+    op.execute("CREATE TABLE logs (LIKE logs_partitioned INCLUDING DEFAULTS)")
+
+    # Dropping the partitioned table drops all of its partitions
+    _copy_table('logs_partitioned', 'logs')
+    op.execute("ALTER TABLE logs ADD PRIMARY KEY (id)")
+    _create_indexes()
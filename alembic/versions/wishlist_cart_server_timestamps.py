@@ -0,0 +1,47 @@
+"""Stamp wishlist and cart created_at on the database server as timestamptz
+
+Revision ID: wishlist_cart_server_timestamps
+Revises: cart_user_course_unique
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'wishlist_cart_server_timestamps'
+down_revision = 'cart_user_course_unique'
+branch_labels = None
+depends_on = None
+
+TABLES = ('wishlists', 'carts')
+
+
+def upgrade():
+    for table in TABLES:
+        # Rows from before the Python default existed get the migration time
+        op.execute(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            # Existing naive values were written with datetime.utcnow()
+            batch_op.alter_column(
+                'created_at',
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                server_default=sa.func.now(),
+                nullable=False,
+                postgresql_using="created_at AT TIME ZONE 'UTC'"
+            )
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                'created_at',
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                server_default=None,
+                nullable=True,
+                postgresql_using="created_at AT TIME ZONE 'UTC'"
+            )
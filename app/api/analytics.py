@@ -1,63 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
-from typing import List, Optional
+from sqlalchemy import func, desc, and_, select
+from typing import Iterator, List, Optional
 from datetime import datetime, timedelta
+import orjson
 
-from ..core.database import get_db
+from ..core.database import SessionLocal, get_db
+from ..core.partitions import drop_partitions_before
 from ..models.api_analytics import APIAnalytics
-from ..models.user import User
 from ..schemas.api_analytics import (
     APIAnalyticsResponse, APIAnalyticsFilter, EndpointStats,
     APIAnalyticsSummary, APIAnalyticsReport, TimeSeriesData,
     GeographicStats, CityStats
 )
-from ..core.security import get_current_active_user
+from ..core.security import TokenUser, is_admin
 
 router = APIRouter(prefix="/admin/analytics", tags=["Analytics"])
 
+# Serializes analytics row lists in one pass through pydantic-core
+_analytics_adapter = TypeAdapter(List[APIAnalyticsResponse])
 
-def is_admin(current_user: User = Depends(get_current_active_user)):
-    """Check if user is admin"""
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    return current_user
+
+def analytics_rows_response(rows: list) -> Response:
+    """Serialize APIAnalytics rows straight to JSON bytes"""
+    records = [APIAnalyticsResponse.from_orm_fast(row) for row in rows]
+    return Response(content=_analytics_adapter.dump_json(records), media_type="application/json")
+
+
+# Rows per exported chunk; each chunk is one columnar NDJSON line
+EXPORT_CHUNK_SIZE = 10_000
+EXPORT_COLUMNS = tuple(APIAnalyticsResponse.model_fields)
+
+
+def export_chunks(start_date: Optional[datetime], end_date: Optional[datetime]) -> Iterator[bytes]:
+    """Yield analytics rows as {column: [values]} NDJSON lines, one per chunk"""
+    # The request's session is closed once the endpoint returns, so the stream owns its own
+    db = SessionLocal()
+    try:
+        query = select(*(getattr(APIAnalytics, name) for name in EXPORT_COLUMNS))
+        if start_date:
+            query = query.where(APIAnalytics.created_at >= start_date)
+        if end_date:
+            query = query.where(APIAnalytics.created_at <= end_date)
+        # yield_per streams from a server-side cursor instead of buffering the whole table
+        result = db.execute(query.order_by(APIAnalytics.id).execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        for rows in result.partitions():
+            yield orjson.dumps(dict(zip(EXPORT_COLUMNS, map(list, zip(*rows))))) + b"\n"
+    finally:
+        db.close()
 
 
 @router.get("/summary", response_model=APIAnalyticsSummary)
 async def get_analytics_summary(
     hours: int = Query(24, description="Time window in hours"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Get overall analytics summary"""
     start_time = datetime.utcnow() - timedelta(hours=hours)
     
-    # Total requests
-    total_requests = db.query(func.count(APIAnalytics.id)).filter(
-        APIAnalytics.created_at >= start_time
-    ).scalar()
-    
-    # Total unique endpoints
-    total_endpoints = db.query(func.count(func.distinct(APIAnalytics.endpoint))).filter(
-        APIAnalytics.created_at >= start_time
-    ).scalar()
-    
-    # Average response time
-    avg_response_time = db.query(func.avg(APIAnalytics.response_time_ms)).filter(
+    # Totals in a single pass over the window
+    totals = db.query(
+        func.count(APIAnalytics.id).label('total_requests'),
+        func.count(func.distinct(APIAnalytics.endpoint)).label('total_endpoints'),
+        func.avg(APIAnalytics.response_time_ms).label('avg_time'),
+        func.count(APIAnalytics.id).filter(APIAnalytics.status_code >= 400).label('total_errors')
+    ).filter(
         APIAnalytics.created_at >= start_time
-    ).scalar() or 0
+    ).one()
     
-    # Total errors (4xx and 5xx)
-    total_errors = db.query(func.count(APIAnalytics.id)).filter(
-        and_(
-            APIAnalytics.created_at >= start_time,
-            APIAnalytics.status_code >= 400
-        )
-    ).scalar()
+    total_requests = totals.total_requests
+    total_endpoints = totals.total_endpoints
+    avg_response_time = totals.avg_time or 0
+    total_errors = totals.total_errors
     
     # Error rate
     error_rate = (total_errors / total_requests * 100) if total_requests > 0 else 0
@@ -142,84 +159,55 @@ async def get_analytics_summary(
 @router.get("/endpoints", response_model=List[EndpointStats])
 async def get_endpoint_stats(
     hours: int = Query(24, description="Time window in hours"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Get statistics for all endpoints"""
     start_time = datetime.utcnow() - timedelta(hours=hours)
     
-    # Get all endpoint combinations
-    endpoints = db.query(
+    # One row per endpoint/method, aggregated in the database
+    rows = db.query(
         APIAnalytics.endpoint,
-        APIAnalytics.method
+        APIAnalytics.method,
+        func.count(APIAnalytics.id).label('total_calls'),
+        func.avg(APIAnalytics.response_time_ms).label('avg_time'),
+        func.min(APIAnalytics.response_time_ms).label('min_time'),
+        func.max(APIAnalytics.response_time_ms).label('max_time'),
+        func.max(APIAnalytics.created_at).label('last_called'),
+        # Success (2xx) and error (4xx/5xx) counts
+        func.count(APIAnalytics.id).filter(
+            and_(APIAnalytics.status_code >= 200, APIAnalytics.status_code < 300)
+        ).label('success_count'),
+        func.count(APIAnalytics.id).filter(APIAnalytics.status_code >= 400).label('error_count')
     ).filter(
         APIAnalytics.created_at >= start_time
-    ).distinct().all()
-    
-    result = []
-    for endpoint, method in endpoints:
-        # Get stats for this endpoint
-        stats = db.query(
-            func.count(APIAnalytics.id).label('total_calls'),
-            func.avg(APIAnalytics.response_time_ms).label('avg_time'),
-            func.min(APIAnalytics.response_time_ms).label('min_time'),
-            func.max(APIAnalytics.response_time_ms).label('max_time'),
-            func.max(APIAnalytics.created_at).label('last_called')
-        ).filter(
-            and_(
-                APIAnalytics.endpoint == endpoint,
-                APIAnalytics.method == method,
-                APIAnalytics.created_at >= start_time
-            )
-        ).first()
-        
-        # Success count (2xx status codes)
-        success_count = db.query(func.count(APIAnalytics.id)).filter(
-            and_(
-                APIAnalytics.endpoint == endpoint,
-                APIAnalytics.method == method,
-                APIAnalytics.created_at >= start_time,
-                APIAnalytics.status_code >= 200,
-                APIAnalytics.status_code < 300
-            )
-        ).scalar()
-        
-        # Error count (4xx and 5xx)
-        error_count = db.query(func.count(APIAnalytics.id)).filter(
-            and_(
-                APIAnalytics.endpoint == endpoint,
-                APIAnalytics.method == method,
-                APIAnalytics.created_at >= start_time,
-                APIAnalytics.status_code >= 400
-            )
-        ).scalar()
-        
-        total_calls = stats.total_calls
-        success_rate = (success_count / total_calls * 100) if total_calls > 0 else 0
-        error_rate = (error_count / total_calls * 100) if total_calls > 0 else 0
-        
-        result.append(EndpointStats(
-            endpoint=endpoint,
-            method=method,
-            total_calls=total_calls,
-            avg_response_time_ms=round(stats.avg_time, 2),
-            min_response_time_ms=round(stats.min_time, 2),
-            max_response_time_ms=round(stats.max_time, 2),
-            success_rate=round(success_rate, 2),
-            error_rate=round(error_rate, 2),
-            last_called=stats.last_called
-        ))
+    ).group_by(
+        APIAnalytics.endpoint, APIAnalytics.method
+    ).order_by(
+        desc('total_calls')
+    ).all()
     
-    # Sort by total calls descending
-    result.sort(key=lambda x: x.total_calls, reverse=True)
-    return result
+    return [
+        EndpointStats(
+            endpoint=row.endpoint,
+            method=row.method,
+            total_calls=row.total_calls,
+            avg_response_time_ms=round(row.avg_time, 2),
+            min_response_time_ms=round(row.min_time, 2),
+            max_response_time_ms=round(row.max_time, 2),
+            success_rate=round(row.success_count / row.total_calls * 100, 2),
+            error_rate=round(row.error_count / row.total_calls * 100, 2),
+            last_called=row.last_called
+        )
+        for row in rows
+    ]
 
 
 @router.get("/time-series", response_model=List[TimeSeriesData])
 async def get_time_series(
     hours: int = Query(24, description="Time window in hours"),
     interval_minutes: int = Query(60, description="Interval in minutes"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Get time-series data for request volume and response times"""
@@ -258,27 +246,30 @@ async def get_time_series(
     return buckets
 
 
+def recent_errors_query(db: Session, limit: int) -> list:
+    """Most recent 4xx/5xx analytics rows"""
+    return db.query(APIAnalytics).filter(
+        APIAnalytics.status_code >= 400
+    ).order_by(
+        desc(APIAnalytics.created_at)
+    ).limit(limit).all()
+
+
 @router.get("/recent-errors", response_model=List[APIAnalyticsResponse])
 async def get_recent_errors(
     limit: int = Query(50, description="Number of recent errors"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Get recent API errors"""
-    errors = db.query(APIAnalytics).filter(
-        APIAnalytics.status_code >= 400
-    ).order_by(
-        desc(APIAnalytics.created_at)
-    ).limit(limit).all()
-    
-    return errors
+    return analytics_rows_response(recent_errors_query(db, limit))
 
 
 @router.get("/slow-requests", response_model=List[APIAnalyticsResponse])
 async def get_slow_requests(
     threshold_ms: float = Query(1000, description="Response time threshold in ms"),
     limit: int = Query(50, description="Number of slow requests"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Get slowest API requests"""
@@ -288,20 +279,20 @@ async def get_slow_requests(
         desc(APIAnalytics.response_time_ms)
     ).limit(limit).all()
     
-    return slow_requests
+    return analytics_rows_response(slow_requests)
 
 
 @router.get("/report", response_model=APIAnalyticsReport)
 async def get_analytics_report(
     hours: int = Query(24, description="Time window in hours"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Get comprehensive analytics report"""
     summary = await get_analytics_summary(hours=hours, current_user=current_user, db=db)
     endpoint_stats = await get_endpoint_stats(hours=hours, current_user=current_user, db=db)
     time_series = await get_time_series(hours=hours, interval_minutes=60, current_user=current_user, db=db)
-    recent_errors = await get_recent_errors(limit=20, current_user=current_user, db=db)
+    recent_errors = recent_errors_query(db, limit=20)
     
     return APIAnalyticsReport(
         summary=summary,
@@ -311,16 +302,32 @@ async def get_analytics_report(
     )
 
 
+@router.get("/export")
+async def export_analytics(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: TokenUser = Depends(is_admin)
+):
+    """Stream raw analytics rows as columnar newline-delimited JSON"""
+    return StreamingResponse(
+        export_chunks(start_date, end_date),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="api_analytics.ndjson"'}
+    )
+
+
 @router.delete("/cleanup")
 async def cleanup_old_analytics(
     days: int = Query(30, description="Delete analytics older than N days"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Delete old analytics data"""
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
-    deleted_count = db.query(APIAnalytics).filter(
+    # Whole expired monthly partitions are dropped; the rest is deleted row by row
+    deleted_count = drop_partitions_before(db, "api_analytics", cutoff_date)
+    deleted_count += db.query(APIAnalytics).filter(
         APIAnalytics.created_at < cutoff_date
     ).delete()
     
@@ -344,7 +351,7 @@ async def search_analytics(
     end_date: Optional[datetime] = None,
     limit: int = Query(100, le=1000),
     offset: int = Query(0),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Search analytics with filters"""
@@ -368,13 +375,13 @@ async def search_analytics(
         query = query.filter(APIAnalytics.created_at <= end_date)
     
     results = query.order_by(desc(APIAnalytics.created_at)).offset(offset).limit(limit).all()
-    return results
+    return analytics_rows_response(results)
 
 
 @router.get("/geographic", response_model=List[GeographicStats])
 async def get_geographic_stats(
     hours: int = Query(24, description="Time window in hours"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Get geographic distribution of API requests"""
@@ -428,7 +435,7 @@ async def get_geographic_stats(
 async def get_city_stats(
     hours: int = Query(24, description="Time window in hours"),
     limit: int = Query(20, description="Top N cities"),
-    current_user: User = Depends(is_admin),
+    current_user: TokenUser = Depends(is_admin),
     db: Session = Depends(get_db)
 ):
     """Get city-level statistics"""
@@ -7,12 +7,12 @@ from datetime import timedelta
 from ..core.database import get_db
 from ..core.security import (
     verify_password, get_password_hash, create_access_token,
-    create_refresh_token, decode_token, get_current_active_user
+    create_refresh_token, decode_token, get_current_active_user,
+    user_token_claims
 )
 from ..core.config import settings
 from ..core.utils import generate_reset_token, create_reset_token_expiry, is_token_expired
 from ..core.logger import auth_logger, log_error, log_auth_event
-from ..core.validation import validate_email, validate_full_name, validate_password, validate_reset_token, validate_oauth_id, validate_url, sanitize_string
 from ..core.email_service import email_service
 from ..models.user import User
 from ..schemas.user import (
@@ -31,14 +31,9 @@ async def signup(
     db: Session = Depends(get_db)
 ) -> Any:
     """Register a new user."""
-    # Validate and sanitize inputs
-    try:
-        clean_email = validate_email(user_data.email)
-        clean_name = validate_full_name(user_data.full_name)
-        validate_password(user_data.password)  # Only validates, doesn't return (will be hashed)
-    except HTTPException as e:
-        log_auth_event(f"Signup validation failed: {e.detail}", email=user_data.email, success=False)
-        raise
+    # Email, name and password are validated and normalized by the UserCreate schema
+    clean_email = user_data.email
+    clean_name = user_data.full_name
     
     # Check if user already exists
     existing_user = db.query(User).filter(User.email == clean_email).first()
@@ -88,20 +83,8 @@ async def login(
     db: Session = Depends(get_db)
 ) -> Any:
     """Login and get access token."""
-    # Validate and sanitize email input
-    try:
-        clean_email = validate_email(user_data.email)
-    except HTTPException:
-        # Don't reveal validation details for login
-        log_auth_event("Login failed - invalid email format", email=user_data.email, success=False)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Find user by email
-    user = db.query(User).filter(User.email == clean_email).first()
+    # Find user by email (validated and lowercased by the UserLogin schema)
+    user = db.query(User).filter(User.email == user_data.email).first()
     
     if not user or not verify_password(user_data.password, user.hashed_password):
         log_auth_event("Login failed - invalid credentials", email=user_data.email, success=False)
@@ -119,7 +102,7 @@ async def login(
         )
     
     # Create tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=user_token_claims(user))
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     log_auth_event("Login successful", user_id=user.id, email=user.email, success=True)
@@ -158,7 +141,7 @@ async def refresh_token(
             )
         
         # Create new tokens
-        access_token = create_access_token(data={"sub": str(user.id)})
+        access_token = create_access_token(data=user_token_claims(user))
         refresh_token = create_refresh_token(data={"sub": str(user.id)})
         
         return {
@@ -182,14 +165,7 @@ async def request_password_reset(
     db: Session = Depends(get_db)
 ) -> Any:
     """Request a password reset token."""
-    # Validate and sanitize email
-    try:
-        clean_email = validate_email(request_data.email)
-    except HTTPException:
-        # Don't reveal if email is invalid for security
-        return {"message": "If the email exists, a reset link has been sent"}
-    
-    user = db.query(User).filter(User.email == clean_email).first()
+    user = db.query(User).filter(User.email == request_data.email).first()
     
     if not user:
         # Don't reveal if email exists or not
@@ -221,11 +197,8 @@ async def reset_password(
     db: Session = Depends(get_db)
 ) -> Any:
     """Reset password using reset token."""
-    # Validate inputs
-    clean_token = validate_reset_token(reset_data.token)
-    validate_password(reset_data.new_password)
-    
-    user = db.query(User).filter(User.reset_token == clean_token).first()
+    # Token format and password strength are validated by the PasswordReset schema
+    user = db.query(User).filter(User.reset_token == reset_data.token).first()
     
     if not user:
         log_auth_event("Password reset failed - invalid token", success=False)
@@ -263,11 +236,11 @@ async def logout(current_user: User = Depends(get_current_active_user)) -> Any:
 @router.post("/oauth/google", response_model=TokenResponse)
 async def oauth_google(user_data: OAuthUserCreate, db: Session = Depends(get_db)) -> Any:
     """Login or register with Google OAuth."""
-    # Validate and sanitize OAuth inputs
-    clean_email = validate_email(user_data.email)
-    clean_name = validate_full_name(user_data.full_name)
-    clean_oauth_id = validate_oauth_id(user_data.oauth_id, "Google")
-    clean_avatar_url = validate_url(user_data.avatar_url, "Avatar URL") if user_data.avatar_url else None
+    # OAuth inputs are validated and normalized by the OAuthUserCreate schema
+    clean_email = user_data.email
+    clean_name = user_data.full_name
+    clean_oauth_id = user_data.oauth_id
+    clean_avatar_url = user_data.avatar_url or None
     
     # Check if user exists with this OAuth provider
     user = db.query(User).filter(
@@ -300,7 +273,7 @@ async def oauth_google(user_data: OAuthUserCreate, db: Session = Depends(get_db)
     
     # Generate tokens
     access_token = create_access_token(
-        data={"sub": str(user.id), "type": "access"}
+        data={**user_token_claims(user), "type": "access"}
     )
     refresh_token = create_refresh_token(
         data={"sub": str(user.id), "type": "refresh"}
@@ -317,11 +290,11 @@ async def oauth_google(user_data: OAuthUserCreate, db: Session = Depends(get_db)
 @router.post("/oauth/linkedin", response_model=TokenResponse)
 async def oauth_linkedin(user_data: OAuthUserCreate, db: Session = Depends(get_db)) -> Any:
     """Login or register with LinkedIn OAuth."""
-    # Validate and sanitize OAuth inputs
-    clean_email = validate_email(user_data.email)
-    clean_name = validate_full_name(user_data.full_name)
-    clean_oauth_id = validate_oauth_id(user_data.oauth_id, "LinkedIn")
-    clean_avatar_url = validate_url(user_data.avatar_url, "Avatar URL") if user_data.avatar_url else None
+    # OAuth inputs are validated and normalized by the OAuthUserCreate schema
+    clean_email = user_data.email
+    clean_name = user_data.full_name
+    clean_oauth_id = user_data.oauth_id
+    clean_avatar_url = user_data.avatar_url or None
     
     # Check if user exists with this OAuth provider
     user = db.query(User).filter(
@@ -354,7 +327,7 @@ async def oauth_linkedin(user_data: OAuthUserCreate, db: Session = Depends(get_d
     
     # Generate tokens
     access_token = create_access_token(
-        data={"sub": str(user.id), "type": "access"}
+        data={**user_token_claims(user), "type": "access"}
     )
     refresh_token = create_refresh_token(
         data={"sub": str(user.id), "type": "refresh"}
@@ -375,9 +348,6 @@ async def change_password(
     db: Session = Depends(get_db)
 ) -> Any:
     """Change user password."""
-    # Validate new password
-    validate_password(password_data.new_password)
-    
     # Check if user has a password (not OAuth user)
     if not current_user.hashed_password:
         raise HTTPException(
@@ -9,6 +9,7 @@ from pathlib import Path
 import uuid
 
 from ..core.database import get_db
+from ..core.cache import cache_clear, SITEMAP_CACHE_NAMESPACE
 from ..core.security import get_current_active_user, get_current_admin_user
 from ..models.user import User
 from ..models.blog import Blog
@@ -125,6 +126,7 @@ async def create_blog(
     db.add(new_blog)
     db.commit()
     db.refresh(new_blog)
+    await cache_clear(SITEMAP_CACHE_NAMESPACE)
     
     return new_blog
 
@@ -267,7 +269,7 @@ async def update_blog(
             detail="Blog post not found"
         )
     
-    update_data = blog_data.dict(exclude_unset=True)
+    update_data = blog_data.model_dump(exclude_unset=True)
     
     # If title is updated, regenerate slug
     if "title" in update_data and update_data["title"] != blog.title:
@@ -307,6 +309,7 @@ async def update_blog(
     
     db.commit()
     db.refresh(blog)
+    await cache_clear(SITEMAP_CACHE_NAMESPACE)
     
     return blog
 
@@ -328,5 +331,6 @@ async def delete_blog(
     
     db.delete(blog)
     db.commit()
+    await cache_clear(SITEMAP_CACHE_NAMESPACE)
     
     return {"message": "Blog post deleted successfully"}
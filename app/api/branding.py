@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import Optional
+import hashlib
 import os
 import shutil
 from pathlib import Path
 import uuid
 
 from ..core.database import get_db
+from ..core.cache import cache_get, cache_set, cache_delete, BRANDING_CACHE_NAMESPACE
 from ..core.security import get_current_admin_user
 from ..models.user import User
 from ..models.branding import BrandingSettings
@@ -22,13 +24,28 @@ router = APIRouter(prefix="/api/branding", tags=["branding"])
 UPLOAD_DIR = Path("uploads/branding")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# The public settings body is served from Redis until branding changes
+BRANDING_CACHE_TTL = 3600  # seconds
+
+
+def branding_response(request: Request, body: bytes) -> Response:
+    """Serve the serialized settings with an ETag, or 304 if the client has them"""
+    headers = {"ETag": f'"{hashlib.md5(body).hexdigest()}"', "Cache-Control": "no-cache"}
+    if headers["ETag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/settings", response_model=BrandingSettingsResponse)
-async def get_branding_settings(db: Session = Depends(get_db)):
+async def get_branding_settings(request: Request, db: Session = Depends(get_db)):
     """
     Get current branding settings (public endpoint).
     Returns default settings if none exist, creating them in the database.
     """
+    cached = await cache_get(BRANDING_CACHE_NAMESPACE, "settings")
+    if cached is not None:
+        return branding_response(request, cached)
+    
     settings = db.query(BrandingSettings).first()
     
     if not settings:
@@ -48,7 +65,10 @@ async def get_branding_settings(db: Session = Depends(get_db)):
         db.commit()
         db.refresh(settings)
     
-    return settings
+    body = BrandingSettingsResponse.model_validate(settings).model_dump_json().encode()
+    await cache_set(BRANDING_CACHE_NAMESPACE, "settings", body, expire=BRANDING_CACHE_TTL)
+    
+    return branding_response(request, body)
 
 
 @router.put("/settings", response_model=BrandingSettingsResponse)
@@ -75,6 +95,7 @@ async def update_branding_settings(
     
     db.commit()
     db.refresh(settings)
+    await cache_delete(BRANDING_CACHE_NAMESPACE, "settings")
     
     return settings
 
@@ -100,6 +121,7 @@ async def create_branding_settings(
     db.add(settings)
     db.commit()
     db.refresh(settings)
+    await cache_delete(BRANDING_CACHE_NAMESPACE, "settings")
     
     return settings
 
@@ -116,6 +138,7 @@ async def reset_branding_settings(
     if settings:
         db.delete(settings)
         db.commit()
+        await cache_delete(BRANDING_CACHE_NAMESPACE, "settings")
     
     return {"message": "Branding settings reset to defaults"}
 
@@ -156,6 +179,7 @@ async def upload_logo(
     settings.logo_url = f"/uploads/branding/{unique_filename}"
     db.commit()
     db.refresh(settings)
+    await cache_delete(BRANDING_CACHE_NAMESPACE, "settings")
     
     return {"url": settings.logo_url, "message": "Logo uploaded successfully"}
 
@@ -195,6 +219,7 @@ async def upload_favicon(
     settings.favicon_url = f"/uploads/branding/{unique_filename}"
     db.commit()
     db.refresh(settings)
+    await cache_delete(BRANDING_CACHE_NAMESPACE, "settings")
     
     return {"url": settings.favicon_url, "message": "Favicon uploaded successfully"}
 
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import List, Any
 from ..core.database import get_db
 from ..core.security import get_current_user
@@ -15,6 +17,19 @@ from ..schemas.course import CourseResponse
 router = APIRouter(tags=["cart-wishlist"])
 
 
+def _insert_if_absent(db: Session, model, user_id: int, course_id: int):
+    """
+    Add a (user, course) row to Wishlist or Cart in one round-trip.
+    Returns the new row, or None if the user already had that course.
+    """
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    return db.execute(
+        insert(model).values(user_id=user_id, course_id=course_id)
+        .on_conflict_do_nothing(index_elements=["user_id", "course_id"])
+        .returning(model.id, model.user_id, model.course_id, model.created_at)
+    ).first()
+
+
 # ==================== WISHLIST ENDPOINTS ====================
 
 @router.post("/wishlist", response_model=WishlistItemResponse)
@@ -37,23 +52,12 @@ async def add_to_wishlist(
     if enrollment:
         raise HTTPException(status_code=400, detail="You are already enrolled in this course")
     
-    # Check if already in wishlist
-    existing = db.query(Wishlist).filter(
-        Wishlist.user_id == current_user.id,
-        Wishlist.course_id == item.course_id
-    ).first()
-    if existing:
+    # Add to wishlist (the unique constraint detects an existing entry)
+    wishlist_item = _insert_if_absent(db, Wishlist, current_user.id, item.course_id)
+    if wishlist_item is None:
         raise HTTPException(status_code=400, detail="Course already in wishlist")
-    
-    # Add to wishlist
-    wishlist_item = Wishlist(
-        user_id=current_user.id,
-        course_id=item.course_id
-    )
-    db.add(wishlist_item)
     db.commit()
-    db.refresh(wishlist_item)
-    return wishlist_item
+    return wishlist_item._asdict()
 
 
 @router.get("/wishlist", response_model=List[CourseResponse])
@@ -105,19 +109,8 @@ async def move_to_cart(
     if not wishlist_item:
         raise HTTPException(status_code=404, detail="Course not found in wishlist")
     
-    # Check if already in cart
-    existing_cart = db.query(Cart).filter(
-        Cart.user_id == current_user.id,
-        Cart.course_id == course_id
-    ).first()
-    
-    if not existing_cart:
-        # Add to cart
-        cart_item = Cart(
-            user_id=current_user.id,
-            course_id=course_id
-        )
-        db.add(cart_item)
+    # Add to cart unless it's already there
+    _insert_if_absent(db, Cart, current_user.id, course_id)
     
     # Remove from wishlist
     db.delete(wishlist_item)
@@ -148,23 +141,12 @@ async def add_to_cart(
     if enrollment:
         raise HTTPException(status_code=400, detail="You are already enrolled in this course")
     
-    # Check if already in cart
-    existing = db.query(Cart).filter(
-        Cart.user_id == current_user.id,
-        Cart.course_id == item.course_id
-    ).first()
-    if existing:
+    # Add to cart (the unique constraint detects an existing entry)
+    cart_item = _insert_if_absent(db, Cart, current_user.id, item.course_id)
+    if cart_item is None:
         raise HTTPException(status_code=400, detail="Course already in cart")
-    
-    # Add to cart
-    cart_item = Cart(
-        user_id=current_user.id,
-        course_id=item.course_id
-    )
-    db.add(cart_item)
     db.commit()
-    db.refresh(cart_item)
-    return cart_item
+    return cart_item._asdict()
 
 
 @router.get("/cart", response_model=List[CourseResponse])
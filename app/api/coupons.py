@@ -99,7 +99,6 @@ async def update_coupon(
     for field, value in update_data.items():
         setattr(coupon, field, value)
     
-    coupon.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(coupon)
     return coupon
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File
+from pydantic import TypeAdapter
+from cachetools import LRUCache
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
 from typing import Any, Optional, List
+import hashlib
+import os
 
 from ..core.database import get_db
+from ..core.cache import cache_clear, cache_get, cache_set, COURSE_CACHE_NAMESPACE, SITEMAP_CACHE_NAMESPACE
 from ..core.security import get_current_active_user, get_current_admin_user
 from ..core.utils import slugify
 from ..core.logger import api_logger, log_error
 from ..models.user import User
-from ..models.course import Course, Lesson
+from ..models.course import Course, Section, Lesson, SCO
 from ..models.enrollment import Enrollment
 from ..schemas.course import (
     CourseCreate, CourseUpdate, CourseResponse, CourseDetailResponse,
@@ -21,6 +26,69 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
+# Columns returned by the course list: the CourseResponse fields plus the row version
+COURSE_LIST_COLUMNS = tuple(getattr(Course, name) for name in CourseResponse.model_fields) + (Course.row_version,)
+
+# Validates a whole page of course rows in one pydantic-core call
+_course_list_adapter = TypeAdapter(List[CourseResponse])
+
+# Validated list entries keyed by (id, created_at, row_version). Every course UPDATE bumps
+# row_version, so an edited course misses and is revalidated in every worker; created_at
+# tells a recreated course apart from a deleted one that had the same id.
+# Instances are shared, never mutated.
+_course_response_cache: LRUCache = LRUCache(maxsize=512)
+
+
+def _course_cache_key(row) -> tuple:
+    return row.id, row.created_at, row.row_version
+
+# Course detail bodies are cached per content version; old versions just expire
+COURSE_CACHE_TTL = 300  # seconds
+
+
+def course_list_responses(rows: list) -> List[CourseResponse]:
+    """CourseResponse per row, reusing the cached instance for unchanged courses"""
+    responses = [_course_response_cache.get(_course_cache_key(row)) for row in rows]
+    misses = [row for row, response in zip(rows, responses) if response is None]
+    if misses:
+        validated = iter(_course_list_adapter.validate_python(misses, from_attributes=True))
+        for index, response in enumerate(responses):
+            if response is None:
+                row = rows[index]
+                responses[index] = _course_response_cache[_course_cache_key(row)] = next(validated)
+    return responses
+
+
+def _child_stats(model):
+    """Latest change time and row count of a course's child rows, as correlated subqueries"""
+    return (
+        select(func.max(func.coalesce(model.updated_at, model.created_at)))
+        .where(model.course_id == Course.id).scalar_subquery(),
+        select(func.count(model.id)).where(model.course_id == Course.id).scalar_subquery()
+    )
+
+
+def course_version(db: Session, slug: str):
+    """
+    Get a course's id, publish flag and ETag from one query, or None if it doesn't exist.
+    The ETag covers the course and its sections, lessons and SCOs; counts are
+    included so that deletions also change it, and the course's row_version so
+    that edits within the same timestamp tick do too.
+    """
+    row = db.execute(
+        select(
+            Course.id, Course.is_published, Course.row_version,
+            func.coalesce(Course.updated_at, Course.created_at),
+            *_child_stats(Section), *_child_stats(Lesson), *_child_stats(SCO)
+        ).where(Course.slug == slug)
+    ).first()
+    if row is None:
+        return None
+    
+    version = "|".join(str(value) for value in row)
+    etag = f'"{hashlib.md5(version.encode()).hexdigest()}"'
+    return row.id, row.is_published, etag
+
 
 @router.get("", response_model=CourseListResponse)
 async def get_courses(
@@ -32,7 +100,8 @@ async def get_courses(
     db: Session = Depends(get_db)
 ) -> Any:
     """Get all courses with pagination and filters."""
-    query = db.query(Course)
+    # Plain column rows: no ORM instances, identity map or relationship loaders
+    query = db.query(*COURSE_LIST_COLUMNS)
     
     # Filter published courses for non-admin users
     if published_only:
@@ -55,40 +124,72 @@ async def get_courses(
     
     # Apply pagination
     offset = (page - 1) * page_size
-    courses = query.order_by(Course.created_at.desc()).offset(offset).limit(page_size).all()
-    
-    return {
-        "courses": courses,
-        "total": total,
-        "page": page,
-        "page_size": page_size
-    }
+    rows = query.order_by(Course.created_at.desc()).offset(offset).limit(page_size).all()
+    
+    # Serialized here by pydantic-core; returning the model would make FastAPI
+    # dump it to a dict and validate it against response_model a second time
+    result = CourseListResponse(
+        courses=course_list_responses(rows),
+        total=total,
+        page=page,
+        page_size=page_size
+    )
+    return Response(content=result.model_dump_json(), media_type="application/json")
 
 
 @router.get("/{slug}", response_model=CourseDetailResponse)
 async def get_course_by_slug(
     slug: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_active_user)
 ) -> Any:
     """Get course details by slug."""
-    course = db.query(Course).filter(Course.slug == slug).first()
+    version = course_version(db, slug)
     
-    if not course:
+    if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
+    course_id, is_published, etag = version
     
     # Check if course is published or user is admin
-    if not course.is_published:
+    if not is_published:
         if not current_user or current_user.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Course not available"
             )
     
-    return course
+    # Clients revalidate every time; unchanged courses cost one small query
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    
+    cache_key = f"{course_id}:{etag}"
+    cached = await cache_get(COURSE_CACHE_NAMESPACE, cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=headers)
+    
+    # Load the serialized collections up front: one query per collection instead
+    # of per-section lesson queries (collections stay lazy for course listings)
+    course = db.query(Course).options(
+        selectinload(Course.sections).selectinload(Section.lessons),
+        selectinload(Course.lessons),
+        selectinload(Course.scos)
+    ).filter(Course.id == course_id).first()
+    
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    body = CourseDetailResponse.model_validate(course).model_dump_json().encode()
+    await cache_set(COURSE_CACHE_NAMESPACE, cache_key, body, expire=COURSE_CACHE_TTL)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
@@ -112,7 +213,7 @@ async def create_course(
         title=course_data.title,
         slug=slug,
         description=course_data.description,
-        price=course_data.price,
+        price=float(course_data.price),
         category=course_data.category,
         thumbnail_url=course_data.thumbnail_url,
         video_url=course_data.video_url,
@@ -123,6 +224,7 @@ async def create_course(
     db.add(new_course)
     db.commit()
     db.refresh(new_course)
+    await cache_clear(SITEMAP_CACHE_NAMESPACE)
     
     return new_course
 
@@ -144,7 +246,7 @@ async def update_course(
         )
     
     # Update fields
-    update_data = course_data.dict(exclude_unset=True)
+    update_data = course_data.model_dump(exclude_unset=True)
     
     # If title is updated, regenerate slug
     if "title" in update_data:
@@ -155,6 +257,7 @@ async def update_course(
     
     db.commit()
     db.refresh(course)
+    await cache_clear(SITEMAP_CACHE_NAMESPACE)
     
     return course
 
@@ -176,6 +279,8 @@ async def delete_course(
     
     db.delete(course)
     db.commit()
+    _course_response_cache.pop(_course_cache_key(course), None)
+    await cache_clear(SITEMAP_CACHE_NAMESPACE)
 
 
 # Lesson endpoints
@@ -228,7 +333,7 @@ async def update_lesson(
             detail="Lesson not found"
         )
     
-    update_data = lesson_data.dict(exclude_unset=True)
+    update_data = lesson_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(lesson, field, value)
     
@@ -291,10 +396,12 @@ async def upload_lesson_video(
             detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}"
         )
     
-    # Validate file size (5GB max)
+    # Validate file size (5GB max); the upload is already spooled to a temp file,
+    # so measure it there instead of reading it into memory
     max_size = 5 * 1024 * 1024 * 1024  # 5GB in bytes
-    file_content = await file.read()
-    if len(file_content) > max_size:
+    file_size = file.file.seek(0, os.SEEK_END)
+    file.file.seek(0)
+    if file_size > max_size:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File size exceeds 5GB limit"
@@ -310,7 +417,7 @@ async def upload_lesson_video(
         
         # Upload to Cloudflare Stream
         upload_result = await cloudflare_service.upload_video_to_stream(
-            file_content=file_content,
+            file=file.file,
             filename=file.filename,
             metadata={
                 "name": lesson.title,
@@ -329,8 +436,9 @@ async def upload_lesson_video(
         
         # Optionally upload to R2 as backup
         try:
-            r2_url = cloudflare_service.upload_to_r2(
-                file_content=file_content,
+            file.file.seek(0)
+            r2_url = await cloudflare_service.upload_to_r2(
+                file=file.file,
                 filename=file.filename
             )
             if r2_url:
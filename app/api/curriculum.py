@@ -363,13 +363,16 @@ def submit_quiz_attempt(
         if previous_attempts >= quiz.max_attempts:
             raise HTTPException(status_code=400, detail="Maximum attempts reached")
     
+    # Index the submitted answers by question once
+    answers = {answer.question_id: answer.value for answer in attempt_data.answers}
+    
     # Calculate score
     total_points = 0
     earned_points = 0
     
     for question in quiz.questions:
         total_points += question.points
-        user_answer = attempt_data.answers.get(question.id)
+        user_answer = answers.get(question.id)
         
         # Check if answer is correct
         if user_answer is not None:
@@ -396,7 +399,7 @@ def submit_quiz_attempt(
         quiz_id=quiz_id,
         user_id=current_user.id,
         attempt_number=attempt_number,
-        answers=attempt_data.answers,
+        answers=answers,  # Stored as {question_id: answer}, as before
         score=earned_points,
         max_score=total_points,
         percentage=percentage,
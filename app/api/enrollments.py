@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update
 from typing import Any, List
 
 from ..core.database import get_db
@@ -46,7 +46,6 @@ async def enroll_in_course(
             # Reactivate enrollment
             existing_enrollment.is_active = True
             db.commit()
-            db.refresh(existing_enrollment)
             return existing_enrollment
     
     # Create new enrollment
@@ -59,7 +58,6 @@ async def enroll_in_course(
     
     db.add(new_enrollment)
     db.commit()
-    db.refresh(new_enrollment)
     
     return new_enrollment
 
@@ -70,9 +68,11 @@ async def get_my_enrollments(
     db: Session = Depends(get_db)
 ) -> Any:
     """Get all courses the current user is enrolled in."""
+    # The bare column renders as the partial index predicate itself (is_active),
+    # which SQLite requires verbatim to use ix_enrollments_active_by_user
     enrollments = db.query(Enrollment).filter(
         Enrollment.user_id == current_user.id,
-        Enrollment.is_active == True
+        Enrollment.is_active
     ).all()
     
     return enrollments
@@ -125,30 +125,29 @@ async def get_enrollment_by_course(
 @router.put("/{enrollment_id}/progress")
 async def update_enrollment_progress(
     enrollment_id: int,
-    progress: float,
+    progress: float = Query(..., ge=0, le=100),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ) -> Any:
     """Update course progress for an enrollment."""
-    enrollment = db.query(Enrollment).filter(
-        Enrollment.id == enrollment_id,
-        Enrollment.user_id == current_user.id
-    ).first()
+    # Single UPDATE ... RETURNING instead of SELECT + UPDATE + refresh
+    result = db.execute(
+        update(Enrollment)
+        .where(
+            Enrollment.id == enrollment_id,
+            Enrollment.user_id == current_user.id
+        )
+        .values(progress=progress)
+        .returning(Enrollment.progress)
+    )
+    row = result.first()
     
-    if not enrollment:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Enrollment not found"
         )
     
-    if progress < 0 or progress > 100:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Progress must be between 0 and 100"
-        )
-    
-    enrollment.progress = progress
     db.commit()
-    db.refresh(enrollment)
     
-    return {"message": "Progress updated successfully", "progress": enrollment.progress}
+    return {"message": "Progress updated successfully", "progress": row.progress}
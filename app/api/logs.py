@@ -1,27 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path as PathParam
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Path as PathParam
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 from ..core.database import get_db
-from ..core.security import get_current_user
-from ..models.user import User
+from ..core.partitions import drop_partitions_before
+from ..core.security import TokenUser, is_admin
 from ..models.log import Log
-from ..schemas.log import LogResponse, LogFilter
-from ..core.logger import api_logger, log_error
+from ..schemas.log import LogResponse, LogSummaryResponse, LogFilter, LogType
+from ..core.logger import api_logger, log_error, LOGS_DIR
 import os
 from pathlib import Path
 
 router = APIRouter()
 
 
-def is_admin(current_user: User = Depends(get_current_user)):
-    """Check if user is admin"""
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    return current_user
+# Columns returned by the log list; extra_data is only served by the detail endpoint
+LOG_SUMMARY_COLUMNS = (
+    Log.id, Log.level, Log.message, Log.logger,
+    Log.module, Log.function, Log.user_id, Log.created_at
+)
 
+# Serializes the log list in one pass through pydantic-core
+_log_summary_adapter = TypeAdapter(List[LogSummaryResponse])
 
-@router.get("/admin/logs", response_model=List[LogResponse])
+
+@router.get("/admin/logs", response_model=List[LogSummaryResponse])
 async def get_logs(
     level: Optional[str] = Query(None, description="Filter by log level"),
     logger: Optional[str] = Query(None, description="Filter by logger name"),
@@ -31,34 +36,38 @@ async def get_logs(
     limit: int = Query(100, le=1000, description="Number of logs to return"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenUser = Depends(is_admin)
 ):
     """
     Get logs from database with filtering options (Admin only)
     """
     try:
-        query = db.query(Log)
+        # Select only the summary columns instead of hydrating full Log objects
+        query = select(*LOG_SUMMARY_COLUMNS)
         
         # Apply filters
         if level:
-            query = query.filter(Log.level == level.upper())
+            query = query.where(Log.level == level.upper())
         if logger:
-            query = query.filter(Log.logger == logger)
+            query = query.where(Log.logger == logger)
         if user_id:
-            query = query.filter(Log.user_id == user_id)
+            query = query.where(Log.user_id == user_id)
         if start_date:
-            query = query.filter(Log.created_at >= start_date)
+            query = query.where(Log.created_at >= start_date)
         if end_date:
-            query = query.filter(Log.created_at <= end_date)
+            query = query.where(Log.created_at <= end_date)
         
-        # Order by most recent first
-        query = query.order_by(Log.created_at.desc())
+        # Order by most recent first; id follows insertion order and has a B-tree
+        # index, while created_at only has a BRIN index (no ordered scans)
+        query = query.order_by(Log.id.desc())
         
         # Pagination
-        logs = query.offset(offset).limit(limit).all()
+        rows = db.execute(query.offset(offset).limit(limit)).all()
+        # Rows come straight from typed columns, so skip validation and serialize directly
+        logs = [LogSummaryResponse.from_orm_fast(row) for row in rows]
         
         api_logger.info(f"Admin {current_user.email} retrieved {len(logs)} logs")
-        return logs
+        return Response(content=_log_summary_adapter.dump_json(logs), media_type="application/json")
         
     except Exception as e:
         log_error(e, "Error retrieving logs", current_user.id)
@@ -72,7 +81,7 @@ async def get_logs_count(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenUser = Depends(is_admin)
 ):
     """Get count of logs by level"""
     try:
@@ -114,7 +123,7 @@ async def get_recent_errors(
     hours: int = Query(24, le=168, description="Hours to look back"),
     limit: int = Query(50, le=200),
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenUser = Depends(is_admin)
 ):
     """Get recent error and warning logs"""
     try:
@@ -136,13 +145,15 @@ async def get_recent_errors(
 async def cleanup_old_logs(
     days: int = Query(30, ge=7, le=365, description="Delete logs older than this many days"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(is_admin)
+    current_user: TokenUser = Depends(is_admin)
 ):
     """Delete logs older than specified days"""
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        deleted_count = db.query(Log).filter(
+        # Whole expired monthly partitions are dropped; the rest is deleted row by row
+        deleted_count = drop_partitions_before(db, "logs", cutoff_date)
+        deleted_count += db.query(Log).filter(
             Log.created_at < cutoff_date
         ).delete(synchronize_session=False)
         
@@ -163,16 +174,16 @@ async def cleanup_old_logs(
 
 @router.get("/admin/logs/file/{log_type}")
 async def download_log_file(
-    log_type: str = PathParam(..., pattern="^(app|api|database|auth|error)$"),
-    current_user: User = Depends(is_admin)
+    log_type: LogType = PathParam(...),
+    current_user: TokenUser = Depends(is_admin)
 ):
     """Download raw log file"""
     from fastapi.responses import FileResponse
-    from pathlib import Path
+    
+    log_type = log_type.value
     
     try:
-        log_dir = Path(__file__).parent.parent.parent / "logs"
-        log_file = log_dir / f"{log_type}.log"
+        log_file = LOGS_DIR / f"{log_type}.log"
         
         if not log_file.exists():
             raise HTTPException(status_code=404, detail="Log file not found")
@@ -190,3 +201,18 @@ async def download_log_file(
     except Exception as e:
         log_error(e, f"Error downloading log file {log_type}", current_user.id)
         raise HTTPException(status_code=500, detail="Failed to download log file")
+
+
+@router.get("/admin/logs/{log_id}", response_model=LogResponse)
+async def get_log(
+    log_id: int,
+    db: Session = Depends(get_db),
+    current_user: TokenUser = Depends(is_admin)
+):
+    """Get a single log entry including its extra data (Admin only)"""
+    log = db.query(Log).filter(Log.id == log_id).first()
+    
+    if not log:
+        raise HTTPException(status_code=404, detail="Log not found")
+    
+    return log
@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import Any, Optional
 from datetime import datetime
+import asyncio
+import requests
 import stripe
 
-from ..core.database import get_db
+from ..core.database import get_db, SessionLocal
 from ..core.security import get_current_active_user, get_current_admin_user
 from ..core.config import settings
+from ..core.logger import log_error
 from ..models.user import User
 from ..models.course import Course
 from ..models.payment import Payment
@@ -20,9 +25,62 @@ from ..schemas.payment import (
 # Configure Stripe
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+# Reuse keep-alive connections to the Stripe API across requests
+_stripe_session = requests.Session()
+_stripe_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=50, pool_maxsize=50))
+stripe.default_http_client = stripe.http_client.RequestsClient(session=_stripe_session)
+
 router = APIRouter(prefix="/payments", tags=["Payments"])
 
 
+def fulfill_checkout_session(session_id: str, payment_intent: Optional[str]) -> None:
+    """
+    Mark a checkout session's payment as completed and enroll the user, in one transaction.
+    Safe to call more than once for the same session; errors are raised to the caller.
+    """
+    db = SessionLocal()
+    try:
+        # Only a pending payment can be completed; a redelivered event matches no row
+        payment = db.execute(
+            update(Payment)
+            .where(
+                Payment.stripe_session_id == session_id,
+                Payment.status == 'pending'
+            )
+            .values(
+                status='completed',
+                stripe_payment_intent_id=payment_intent,
+                completed_at=datetime.utcnow()
+            )
+            .returning(Payment.id, Payment.user_id, Payment.course_id)
+        ).first()
+        
+        # Unknown session or already fulfilled by an earlier delivery
+        if not payment:
+            return
+        
+        # Create enrollment, or reactivate an existing one, in a single statement
+        insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(Enrollment).values(
+            user_id=payment.user_id,
+            course_id=payment.course_id,
+            payment_id=payment.id,
+            is_active=True,
+            progress=0.0
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['user_id', 'course_id'],
+            set_={'is_active': True, 'payment_id': payment.id}
+        ))
+        
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 @router.post("/checkout", response_model=CheckoutSessionResponse)
 async def create_checkout_session(
     request_data: CheckoutSessionRequest,
@@ -52,8 +110,9 @@ async def create_checkout_session(
         )
     
     try:
-        # Create Stripe checkout session
-        checkout_session = stripe.checkout.Session.create(
+        # Create Stripe checkout session (blocking HTTP call, run off the event loop)
+        checkout_session = await asyncio.to_thread(
+            stripe.checkout.Session.create,
             payment_method_types=['card'],
             line_items=[
                 {
@@ -108,14 +167,14 @@ async def create_checkout_session(
 @router.post("/webhook")
 async def stripe_webhook(
     request: Request,
-    stripe_signature: str = Header(None),
-    db: Session = Depends(get_db)
+    stripe_signature: str = Header(None)
 ) -> Any:
     """Handle Stripe webhook events."""
     payload = await request.body()
     
     try:
-        event = stripe.Webhook.construct_event(
+        event = await asyncio.to_thread(
+            stripe.Webhook.construct_event,
             payload, stripe_signature, settings.STRIPE_WEBHOOK_SECRET
         )
     except ValueError:
@@ -124,30 +183,17 @@ async def stripe_webhook(
         raise HTTPException(status_code=400, detail="Invalid signature")
     
     # Handle the checkout.session.completed event
+    # Fulfilment completes before Stripe gets its 2xx; on failure the 5xx makes Stripe redeliver
     if event['type'] == 'checkout.session.completed':
         session = event['data']['object']
-        
-        # Get payment record
-        payment = db.query(Payment).filter(
-            Payment.stripe_session_id == session.id
-        ).first()
-        
-        if payment:
-            # Update payment status
-            payment.status = 'completed'
-            payment.stripe_payment_intent_id = session.payment_intent
-            payment.completed_at = datetime.utcnow()
-            
-            # Create enrollment
-            enrollment = Enrollment(
-                user_id=payment.user_id,
-                course_id=payment.course_id,
-                is_active=True,
-                progress=0.0
+        try:
+            await asyncio.to_thread(fulfill_checkout_session, session.id, session.payment_intent)
+        except Exception as e:
+            log_error(e, f"Error fulfilling checkout session {session.id}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Fulfilment failed"
             )
-            
-            db.add(enrollment)
-            db.commit()
     
     return {"status": "success"}
 
@@ -171,18 +217,21 @@ async def get_payment_stats(
     db: Session = Depends(get_db)
 ) -> Any:
     """Get payment statistics (Admin only)."""
-    # Total revenue
-    total_revenue = db.query(func.sum(Payment.amount)).filter(
-        Payment.status == 'completed'
-    ).scalar() or 0.0
+    # Count and revenue per status in a single query
+    rows = db.query(
+        Payment.status,
+        func.count(Payment.id),
+        func.coalesce(func.sum(Payment.amount), 0.0)
+    ).group_by(Payment.status).all()
     
-    # Total transactions
-    total_transactions = db.query(Payment).count()
+    counts = {payment_status: count for payment_status, count, _ in rows}
+    totals = {payment_status: amount for payment_status, _, amount in rows}
     
-    # Payment status counts
-    successful_payments = db.query(Payment).filter(Payment.status == 'completed').count()
-    pending_payments = db.query(Payment).filter(Payment.status == 'pending').count()
-    failed_payments = db.query(Payment).filter(Payment.status == 'failed').count()
+    total_revenue = totals.get('completed', 0.0)
+    total_transactions = sum(counts.values())
+    successful_payments = counts.get('completed', 0)
+    pending_payments = counts.get('pending', 0)
+    failed_payments = counts.get('failed', 0)
     
     return {
         "total_revenue": total_revenue,
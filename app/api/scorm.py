@@ -1,17 +1,142 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import Any, Dict, Optional
+from sqlalchemy import func, and_, select, insert, literal
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime
 import json
+import re
+from types import SimpleNamespace
 
 from ..core.database import get_db
 from ..core.security import get_current_active_user, get_current_admin_user
+from ..core.cache import cache_hset, cache_hgetall, cache_delete
 from ..models.user import User
 from ..models.course import SCO, LearnerAttempt
 from ..models.enrollment import Enrollment
 
 router = APIRouter(prefix="/scorm", tags=["SCORM"])
 
+# ISO 8601 duration as used by cmi.session_time (PT#H#M#S)
+SCORM_DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?')
+
+
+# CMI element setters: each applies a value to the attempt and returns an
+# error code, or None on success
+
+def _set_completion_status(attempt: LearnerAttempt, value: str) -> Optional[str]:
+    if value in ["completed", "incomplete", "not attempted", "unknown"]:
+        attempt.completion_status = value
+        if value == "completed" and not attempt.completed_at:
+            attempt.completed_at = datetime.utcnow()
+
+
+def _set_success_status(attempt: LearnerAttempt, value: str) -> Optional[str]:
+    if value in ["passed", "failed", "unknown"]:
+        attempt.success_status = value
+
+
+def _set_suspend_data(attempt: LearnerAttempt, value: str) -> Optional[str]:
+    if len(value) > 64000:  # SCORM 2004 limit
+        return "405"  # Data size exceeded
+    attempt.suspend_data = value
+
+
+def _set_session_time(attempt: LearnerAttempt, value: str) -> Optional[str]:
+    match = SCORM_DURATION_RE.match(value)
+    if match:
+        hours = int(match.group(1) or 0)
+        minutes = int(match.group(2) or 0)
+        seconds = float(match.group(3) or 0)
+        attempt.session_time = int(hours * 3600 + minutes * 60 + seconds)
+        attempt.total_time += attempt.session_time
+
+
+def _float_setter(field: str) -> Callable[[LearnerAttempt, str], Optional[str]]:
+    def setter(attempt: LearnerAttempt, value: str) -> Optional[str]:
+        setattr(attempt, field, float(value) if value else None)
+    return setter
+
+
+def _str_setter(field: str) -> Callable[[LearnerAttempt, str], Optional[str]]:
+    def setter(attempt: LearnerAttempt, value: str) -> Optional[str]:
+        setattr(attempt, field, value)
+    return setter
+
+
+CMI_SETTERS: Dict[str, Callable[[LearnerAttempt, str], Optional[str]]] = {
+    "cmi.completion_status": _set_completion_status,
+    "cmi.success_status": _set_success_status,
+    "cmi.score.raw": _float_setter("score_raw"),
+    "cmi.score.min": _float_setter("score_min"),
+    "cmi.score.max": _float_setter("score_max"),
+    "cmi.score.scaled": _float_setter("score_scaled"),
+    "cmi.location": _str_setter("location"),
+    "cmi.suspend_data": _set_suspend_data,
+    "cmi.exit": _str_setter("exit_mode"),
+    "cmi.session_time": _set_session_time,
+    "cmi.progress_measure": _float_setter("progress_measure"),
+}
+
+def _optional_str(value) -> str:
+    return str(value) if value is not None else ""
+
+
+# CMI element getters: only the requested element is computed
+CMI_GETTERS: Dict[str, Callable[[LearnerAttempt, User], str]] = {
+    "cmi.completion_status": lambda a, u: a.completion_status,
+    "cmi.success_status": lambda a, u: a.success_status,
+    "cmi.score.raw": lambda a, u: _optional_str(a.score_raw),
+    "cmi.score.min": lambda a, u: _optional_str(a.score_min),
+    "cmi.score.max": lambda a, u: _optional_str(a.score_max),
+    "cmi.score.scaled": lambda a, u: _optional_str(a.score_scaled),
+    "cmi.location": lambda a, u: a.location or "",
+    "cmi.suspend_data": lambda a, u: a.suspend_data or "",
+    "cmi.entry": lambda a, u: a.entry or "",
+    "cmi.exit": lambda a, u: a.exit_mode or "",
+    "cmi.session_time": lambda a, u: f"PT{a.session_time}S" if a.session_time else "PT0S",
+    "cmi.total_time": lambda a, u: f"PT{a.total_time}S" if a.total_time else "PT0S",
+    "cmi.progress_measure": lambda a, u: _optional_str(a.progress_measure),
+    "cmi.learner_id": lambda a, u: str(u.id),
+    "cmi.learner_name": lambda a, u: u.full_name or u.email,
+    "cmi.mode": lambda a, u: "normal",
+    "cmi.credit": lambda a, u: "credit",
+}
+
+# SetValue calls are staged in Redis per attempt and applied to the database on commit/finish
+SCORM_STAGING_NAMESPACE = "scorm:attempt"
+SCORM_STAGING_TTL = 24 * 3600  # seconds
+
+
+def _staging_key(attempt_id: int, user_id: int) -> str:
+    return f"{attempt_id}:{user_id}"
+
+
+def _validate_cmi_value(element: str, value: str) -> Optional[str]:
+    """Check a value with its setter against a scratch object, without loading the attempt"""
+    setter = CMI_SETTERS.get(element)
+    if not setter:
+        return None
+    return setter(SimpleNamespace(completed_at=None, total_time=0), value)
+
+
+async def _read_staged_values(attempt: LearnerAttempt, staging_key: str) -> Dict[str, str]:
+    """
+    Staged SetValue calls for an attempt. Without any (Redis down, values written
+    through to the database) Redis isn't consulted; with some, a Redis error is raised
+    so the caller fails with 391 instead of dropping them.
+    """
+    if not attempt.has_staged_values:
+        return {}
+    return await cache_hgetall(SCORM_STAGING_NAMESPACE, staging_key, strict=True)
+
+
+def _apply_staged_values(attempt: LearnerAttempt, staged: Dict[str, str]) -> None:
+    """Apply staged CMI values to the attempt"""
+    for element, value in staged.items():
+        setter = CMI_SETTERS.get(element)
+        if setter:
+            setter(attempt, value)
+
 
 # SCORM RTE (Run-Time Environment) API Implementation
 # Compliant with SCORM 2004 4th Edition
@@ -26,18 +151,20 @@ async def scorm_initialize(
     LMSInitialize - Initialize SCORM communication session
     Returns: {"success": true, "error_code": "0", "attempt_id": 123}
     """
-    # Get SCO
-    sco = db.query(SCO).filter(SCO.id == sco_id).first()
-    if not sco:
-        return {"success": False, "error_code": "201", "error_message": "Invalid SCO ID"}
+    # Get SCO together with the user's active enrollment in its course
+    row = db.query(SCO, Enrollment).outerjoin(
+        Enrollment,
+        and_(
+            Enrollment.course_id == SCO.course_id,
+            Enrollment.user_id == current_user.id,
+            Enrollment.is_active == True
+        )
+    ).filter(SCO.id == sco_id).first()
     
-    # Check enrollment
-    enrollment = db.query(Enrollment).filter(
-        Enrollment.user_id == current_user.id,
-        Enrollment.course_id == sco.course_id,
-        Enrollment.is_active == True
-    ).first()
+    if not row:
+        return {"success": False, "error_code": "201", "error_message": "Invalid SCO ID"}
     
+    sco, enrollment = row
     if not enrollment:
         return {"success": False, "error_code": "401", "error_message": "User not enrolled"}
     
@@ -50,34 +177,36 @@ async def scorm_initialize(
     ).first()
     
     if not attempt:
-        # Count previous attempts
-        attempt_count = db.query(LearnerAttempt).filter(
+        # Create new attempt; the attempt number is computed in the same statement
+        next_attempt = select(
+            literal(current_user.id),
+            literal(sco_id),
+            literal(enrollment.id),
+            func.coalesce(func.max(LearnerAttempt.attempt_number), 0) + 1,
+            literal("ab-initio"),
+            literal("not attempted")
+        ).where(
             LearnerAttempt.user_id == current_user.id,
             LearnerAttempt.sco_id == sco_id
-        ).count()
-        
-        # Create new attempt
-        attempt = LearnerAttempt(
-            user_id=current_user.id,
-            sco_id=sco_id,
-            enrollment_id=enrollment.id,
-            attempt_number=attempt_count + 1,
-            entry="ab-initio",
-            completion_status="not attempted"
         )
-        db.add(attempt)
+        attempt_id = db.execute(
+            insert(LearnerAttempt).from_select(
+                ["user_id", "sco_id", "enrollment_id", "attempt_number", "entry", "completion_status"],
+                next_attempt
+            ).returning(LearnerAttempt.id)
+        ).scalar_one()
     else:
         # Resume existing attempt
         attempt.entry = "resume"
         attempt.last_accessed_at = datetime.utcnow()
+        attempt_id = attempt.id
     
     db.commit()
-    db.refresh(attempt)
     
     return {
         "success": True,
         "error_code": "0",
-        "attempt_id": attempt.id,
+        "attempt_id": attempt_id,
         "launch_data": sco.launch_data or "",
         "mastery_score": sco.mastery_score
     }
@@ -102,28 +231,13 @@ async def scorm_get_value(
     if not attempt:
         return {"success": False, "error_code": "201", "value": ""}
     
-    # Map CMI elements to database fields
-    cmi_map = {
-        "cmi.completion_status": attempt.completion_status,
-        "cmi.success_status": attempt.success_status,
-        "cmi.score.raw": str(attempt.score_raw) if attempt.score_raw is not None else "",
-        "cmi.score.min": str(attempt.score_min) if attempt.score_min is not None else "",
-        "cmi.score.max": str(attempt.score_max) if attempt.score_max is not None else "",
-        "cmi.score.scaled": str(attempt.score_scaled) if attempt.score_scaled is not None else "",
-        "cmi.location": attempt.location or "",
-        "cmi.suspend_data": attempt.suspend_data or "",
-        "cmi.entry": attempt.entry or "",
-        "cmi.exit": attempt.exit_mode or "",
-        "cmi.session_time": f"PT{attempt.session_time}S" if attempt.session_time else "PT0S",
-        "cmi.total_time": f"PT{attempt.total_time}S" if attempt.total_time else "PT0S",
-        "cmi.progress_measure": str(attempt.progress_measure) if attempt.progress_measure is not None else "",
-        "cmi.learner_id": str(current_user.id),
-        "cmi.learner_name": current_user.full_name or current_user.email,
-        "cmi.mode": "normal",
-        "cmi.credit": "credit",
-    }
-    
-    value = cmi_map.get(element, "")
+    # Values set since the last commit take precedence over stored ones
+    staged = await cache_hgetall(SCORM_STAGING_NAMESPACE, _staging_key(attempt_id, current_user.id))
+    if element in staged:
+        value = staged[element]
+    else:
+        getter = CMI_GETTERS.get(element)
+        value = getter(attempt, current_user) if getter else ""
     
     return {
         "success": True,
@@ -144,73 +258,51 @@ async def scorm_set_value(
     LMSSetValue - Set value in CMI data model
     Updates are cached until LMSCommit is called
     """
-    attempt = db.query(LearnerAttempt).filter(
+    try:
+        error_code = _validate_cmi_value(element, value)
+        if error_code:
+            return {"success": False, "error_code": error_code}
+    except Exception as e:
+        return {"success": False, "error_code": "405", "error_message": str(e)}
+    
+    # Only the attempt's owner may write to it (narrow lookup; the row is loaded below if needed)
+    owned = db.query(LearnerAttempt.id, LearnerAttempt.has_staged_values).filter(
         LearnerAttempt.id == attempt_id,
         LearnerAttempt.user_id == current_user.id
     ).first()
     
-    if not attempt:
+    if not owned:
         return {"success": False, "error_code": "201"}
     
-    # Update appropriate field based on element
+    # Stage the value in Redis; the database only records that something is staged
+    # (once per commit cycle), so LMSCommit knows a failed Redis read would lose data
+    if element in CMI_SETTERS and await cache_hset(
+        SCORM_STAGING_NAMESPACE, _staging_key(attempt_id, current_user.id),
+        element, value, expire=SCORM_STAGING_TTL
+    ):
+        if not owned.has_staged_values:
+            db.query(LearnerAttempt).filter(LearnerAttempt.id == attempt_id).update(
+                {LearnerAttempt.has_staged_values: True}, synchronize_session=False
+            )
+            db.commit()
+        return {"success": True, "error_code": "0"}
+    
+    # Redis unavailable (or element not stored): write through to the database
+    attempt = db.get(LearnerAttempt, attempt_id)
+    
     try:
-        if element == "cmi.completion_status":
-            if value in ["completed", "incomplete", "not attempted", "unknown"]:
-                attempt.completion_status = value
-                if value == "completed" and not attempt.completed_at:
-                    attempt.completed_at = datetime.utcnow()
-        
-        elif element == "cmi.success_status":
-            if value in ["passed", "failed", "unknown"]:
-                attempt.success_status = value
-        
-        elif element == "cmi.score.raw":
-            attempt.score_raw = float(value) if value else None
-        
-        elif element == "cmi.score.min":
-            attempt.score_min = float(value) if value else None
-        
-        elif element == "cmi.score.max":
-            attempt.score_max = float(value) if value else None
-        
-        elif element == "cmi.score.scaled":
-            attempt.score_scaled = float(value) if value else None
-        
-        elif element == "cmi.location":
-            attempt.location = value
-        
-        elif element == "cmi.suspend_data":
-            if len(value) <= 64000:  # SCORM 2004 limit
-                attempt.suspend_data = value
-            else:
-                return {"success": False, "error_code": "405"}  # Data size exceeded
-        
-        elif element == "cmi.exit":
-            attempt.exit_mode = value
-        
-        elif element == "cmi.session_time":
-            # Parse ISO 8601 duration (PT#H#M#S)
-            import re
-            match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?', value)
-            if match:
-                hours = int(match.group(1) or 0)
-                minutes = int(match.group(2) or 0)
-                seconds = float(match.group(3) or 0)
-                attempt.session_time = int(hours * 3600 + minutes * 60 + seconds)
-                attempt.total_time += attempt.session_time
-        
-        elif element == "cmi.progress_measure":
-            attempt.progress_measure = float(value) if value else None
-        
-        else:
-            # Handle other elements like interactions, objectives, comments
-            pass
+        setter = CMI_SETTERS.get(element)
+        if setter:
+            setter(attempt, value)
+        # Other elements (interactions, objectives, comments) are accepted but not stored
         
         attempt.last_accessed_at = datetime.utcnow()
+        db.commit()
         
         return {"success": True, "error_code": "0"}
     
     except Exception as e:
+        db.rollback()
         return {"success": False, "error_code": "405", "error_message": str(e)}
 
 
@@ -231,8 +323,16 @@ async def scorm_commit(
     if not attempt:
         return {"success": False, "error_code": "201"}
     
+    staging_key = _staging_key(attempt_id, current_user.id)
+    
     try:
+        staged = await _read_staged_values(attempt, staging_key)
+        if staged:
+            _apply_staged_values(attempt, staged)
+            attempt.last_accessed_at = datetime.utcnow()
+        attempt.has_staged_values = False
         db.commit()
+        await cache_delete(SCORM_STAGING_NAMESPACE, staging_key)
         return {"success": True, "error_code": "0"}
     except Exception as e:
         db.rollback()
@@ -257,8 +357,12 @@ async def scorm_finish(
     if not attempt:
         return {"success": False, "error_code": "201"}
     
+    staging_key = _staging_key(attempt_id, current_user.id)
+    
     try:
-        # Final commit
+        # Final commit, including any values not yet committed
+        _apply_staged_values(attempt, await _read_staged_values(attempt, staging_key))
+        attempt.has_staged_values = False
         attempt.last_accessed_at = datetime.utcnow()
         
         # If completion status is still "not attempted", set to "incomplete"
@@ -266,6 +370,7 @@ async def scorm_finish(
             attempt.completion_status = "incomplete"
         
         db.commit()
+        await cache_delete(SCORM_STAGING_NAMESPACE, staging_key)
         return {"success": True, "error_code": "0"}
     except Exception as e:
         db.rollback()
@@ -314,15 +419,28 @@ async def get_course_scorm_progress(
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    scos = db.query(SCO).filter(SCO.course_id == course_id).all()
+    # Latest attempt number per SCO for this user
+    latest = db.query(
+        LearnerAttempt.sco_id,
+        func.max(LearnerAttempt.attempt_number).label("attempt_number")
+    ).filter(
+        LearnerAttempt.user_id == current_user.id
+    ).group_by(LearnerAttempt.sco_id).subquery()
     
-    progress = []
-    for sco in scos:
-        latest_attempt = db.query(LearnerAttempt).filter(
-            LearnerAttempt.sco_id == sco.id,
+    # Every SCO in the course joined with its latest attempt (if any) in one query
+    rows = db.query(SCO, LearnerAttempt).outerjoin(
+        latest, latest.c.sco_id == SCO.id
+    ).outerjoin(
+        LearnerAttempt,
+        and_(
+            LearnerAttempt.sco_id == latest.c.sco_id,
+            LearnerAttempt.attempt_number == latest.c.attempt_number,
             LearnerAttempt.user_id == current_user.id
-        ).order_by(LearnerAttempt.attempt_number.desc()).first()
-        
+        )
+    ).filter(SCO.course_id == course_id).order_by(SCO.id).all()
+    
+    progress = []
+    for sco, latest_attempt in rows:
         progress.append({
             "sco_id": sco.id,
             "title": sco.title,
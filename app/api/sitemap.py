@@ -1,29 +1,74 @@
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 from datetime import datetime
+import gzip
+import hashlib
+from xml.sax.saxutils import escape
 from ..core.database import get_db
+from ..core.cache import cache_get, cache_set, SITEMAP_CACHE_NAMESPACE
 from ..models.blog import Blog
 from ..models.course import Course
+from ..models.user import User
 
 router = APIRouter(tags=["SEO"])
 
+# Sitemap and RSS are served from Redis between rebuilds
+SITEMAP_CACHE_TTL = 3600  # seconds
+
+
+def sitemap_headers(version: str) -> dict:
+    """Response headers for a cached version token ("<etag>|<last-modified>")"""
+    etag, last_modified = version.split("|", 1)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={SITEMAP_CACHE_TTL}"}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def xml_response(request: Request, compressed: bytes, headers: dict = None) -> Response:
+    """Serve a gzip-compressed XML payload, decompressing only for clients without gzip support"""
+    headers = dict(headers or {}, Vary="Accept-Encoding")
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=compressed, media_type="application/xml", headers=headers)
+    return Response(content=gzip.decompress(compressed), media_type="application/xml", headers=headers)
+
 
 @router.get("/sitemap.xml", response_class=Response)
-async def generate_sitemap(db: Session = Depends(get_db)):
+async def generate_sitemap(request: Request, db: Session = Depends(get_db)):
     """Generate XML sitemap for search engines."""
-    
-    # Get all published blogs
-    blogs = db.query(Blog).filter(Blog.is_published == True).all()
+    # The version token is cached next to the body (same TTL, cleared with it on
+    # blog/course writes), so conditional requests never touch the database
+    cached_version = await cache_get(SITEMAP_CACHE_NAMESPACE, "sitemap.version")
+    if cached_version is not None:
+        headers = sitemap_headers(cached_version.decode())
+        
+        # Crawler already has the current version
+        if headers["ETag"] in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        
+        cached = await cache_get(SITEMAP_CACHE_NAMESPACE, "sitemap.xml.gz")
+        if cached is not None:
+            return xml_response(request, cached, headers)
+    
+    # Get all published blogs (only the columns the sitemap uses)
+    blogs = db.query(
+        Blog.slug, Blog.updated_at, Blog.published_at, Blog.created_at
+    ).filter(Blog.is_published == True).all()
     
     # Get all published courses
-    courses = db.query(Course).filter(Course.is_published == True).all()
+    courses = db.query(
+        Course.slug, Course.updated_at, Course.created_at
+    ).filter(Course.is_published == True).all()
     
     # Base URL - replace with your actual domain
     base_url = "https://yourdomain.com"
     
-    # Build sitemap XML
-    xml_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml_content += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    # Build sitemap XML (parts are joined once at the end)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+    ]
     
     # Static pages
     static_pages = [
@@ -36,73 +81,110 @@ async def generate_sitemap(db: Session = Depends(get_db)):
     ]
     
     for page in static_pages:
-        xml_content += f'  <url>\n'
-        xml_content += f'    <loc>{base_url}{page["loc"]}</loc>\n'
-        xml_content += f'    <changefreq>{page["changefreq"]}</changefreq>\n'
-        xml_content += f'    <priority>{page["priority"]}</priority>\n'
-        xml_content += f'  </url>\n'
+        parts.append(
+            f'  <url>\n'
+            f'    <loc>{base_url}{page["loc"]}</loc>\n'
+            f'    <changefreq>{page["changefreq"]}</changefreq>\n'
+            f'    <priority>{page["priority"]}</priority>\n'
+            f'  </url>\n'
+        )
+    
+    last_modified = None
     
     # Blog pages
     for blog in blogs:
         last_mod = blog.updated_at or blog.published_at or blog.created_at
-        xml_content += f'  <url>\n'
-        xml_content += f'    <loc>{base_url}/blogs/{blog.slug}</loc>\n'
-        xml_content += f'    <lastmod>{last_mod.strftime("%Y-%m-%d")}</lastmod>\n'
-        xml_content += f'    <changefreq>weekly</changefreq>\n'
-        xml_content += f'    <priority>0.7</priority>\n'
-        xml_content += f'  </url>\n'
+        last_modified = max(last_modified or last_mod, last_mod)
+        parts.append(
+            f'  <url>\n'
+            f'    <loc>{base_url}/blogs/{escape(blog.slug)}</loc>\n'
+            f'    <lastmod>{last_mod.strftime("%Y-%m-%d")}</lastmod>\n'
+            f'    <changefreq>weekly</changefreq>\n'
+            f'    <priority>0.7</priority>\n'
+            f'  </url>\n'
+        )
     
     # Course pages
     for course in courses:
         last_mod = course.updated_at or course.created_at
-        xml_content += f'  <url>\n'
-        xml_content += f'    <loc>{base_url}/courses/{course.slug}</loc>\n'
-        xml_content += f'    <lastmod>{last_mod.strftime("%Y-%m-%d")}</lastmod>\n'
-        xml_content += f'    <changefreq>weekly</changefreq>\n'
-        xml_content += f'    <priority>0.8</priority>\n'
-        xml_content += f'  </url>\n'
-    
-    xml_content += '</urlset>'
-    
-    return Response(content=xml_content, media_type="application/xml")
+        last_modified = max(last_modified or last_mod, last_mod)
+        parts.append(
+            f'  <url>\n'
+            f'    <loc>{base_url}/courses/{escape(course.slug)}</loc>\n'
+            f'    <lastmod>{last_mod.strftime("%Y-%m-%d")}</lastmod>\n'
+            f'    <changefreq>weekly</changefreq>\n'
+            f'    <priority>0.8</priority>\n'
+            f'  </url>\n'
+        )
+    
+    parts.append('</urlset>')
+    xml_content = "".join(parts)
+    
+    # Compress once; the cached copy is served as-is to gzip-capable clients
+    compressed = gzip.compress(xml_content.encode("utf-8"), compresslevel=6)
+    
+    # The ETag is a digest of the content itself, so any change (including deletions) changes it
+    etag = f'"{hashlib.md5(xml_content.encode()).hexdigest()}"'
+    version = f"{etag}|{last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT') if last_modified else ''}"
+    await cache_set(SITEMAP_CACHE_NAMESPACE, "sitemap.xml.gz", compressed, expire=SITEMAP_CACHE_TTL)
+    await cache_set(SITEMAP_CACHE_NAMESPACE, "sitemap.version", version, expire=SITEMAP_CACHE_TTL)
+    
+    headers = sitemap_headers(version)
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return xml_response(request, compressed, headers)
 
 
 @router.get("/rss.xml", response_class=Response)
-async def generate_blog_rss(db: Session = Depends(get_db)):
+async def generate_blog_rss(request: Request, db: Session = Depends(get_db)):
     """Generate RSS feed for blog posts."""
+    cached = await cache_get(SITEMAP_CACHE_NAMESPACE, "rss.xml.gz")
+    if cached is not None:
+        return xml_response(request, cached)
     
     # Get recent published blogs
-    blogs = db.query(Blog).filter(
+    # Only the columns the feed uses, with the author joined in the same query
+    blogs = db.query(
+        Blog.slug, Blog.title, Blog.excerpt, Blog.published_at, Blog.created_at,
+        User.email.label("author_email"), User.full_name.label("author_name")
+    ).outerjoin(User, Blog.author_id == User.id).filter(
         Blog.is_published == True
     ).order_by(Blog.published_at.desc()).limit(20).all()
     
     base_url = "https://yourdomain.com"
     
-    # Build RSS XML
-    xml_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml_content += '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n'
-    xml_content += '  <channel>\n'
-    xml_content += '    <title>LMS Blog - Learning Resources</title>\n'
-    xml_content += f'    <link>{base_url}/blogs</link>\n'
-    xml_content += '    <description>Latest educational articles, tutorials, and learning resources from our LMS platform.</description>\n'
-    xml_content += '    <language>en-us</language>\n'
-    xml_content += f'    <lastBuildDate>{datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>\n'
-    xml_content += f'    <atom:link href="{base_url}/rss.xml" rel="self" type="application/rss+xml" />\n'
+    # Build RSS XML (parts are joined once at the end)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n',
+        '  <channel>\n',
+        '    <title>LMS Blog - Learning Resources</title>\n',
+        f'    <link>{base_url}/blogs</link>\n',
+        '    <description>Latest educational articles, tutorials, and learning resources from our LMS platform.</description>\n',
+        '    <language>en-us</language>\n',
+        f'    <lastBuildDate>{datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>\n',
+        f'    <atom:link href="{base_url}/rss.xml" rel="self" type="application/rss+xml" />\n',
+    ]
     
     for blog in blogs:
         pub_date = blog.published_at or blog.created_at
-        xml_content += '    <item>\n'
-        xml_content += f'      <title>{blog.title}</title>\n'
-        xml_content += f'      <link>{base_url}/blogs/{blog.slug}</link>\n'
-        xml_content += f'      <guid>{base_url}/blogs/{blog.slug}</guid>\n'
-        xml_content += f'      <pubDate>{pub_date.strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>\n'
+        parts.append('    <item>\n')
+        parts.append(f'      <title>{escape(blog.title)}</title>\n')
+        parts.append(f'      <link>{base_url}/blogs/{escape(blog.slug)}</link>\n')
+        parts.append(f'      <guid>{base_url}/blogs/{escape(blog.slug)}</guid>\n')
+        parts.append(f'      <pubDate>{pub_date.strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>\n')
         if blog.excerpt:
-            xml_content += f'      <description><![CDATA[{blog.excerpt}]]></description>\n'
-        if blog.author:
-            xml_content += f'      <author>{blog.author.email} ({blog.author.full_name})</author>\n'
-        xml_content += '    </item>\n'
+            parts.append(f'      <description>{escape(blog.excerpt)}</description>\n')
+        if blog.author_email:
+            parts.append(f'      <author>{escape(blog.author_email)} ({escape(blog.author_name or "")})</author>\n')
+        parts.append('    </item>\n')
+    
+    parts.append('  </channel>\n')
+    parts.append('</rss>')
+    xml_content = "".join(parts)
     
-    xml_content += '  </channel>\n'
-    xml_content += '</rss>'
+    # Compress once; the cached copy is served as-is to gzip-capable clients
+    compressed = gzip.compress(xml_content.encode("utf-8"), compresslevel=6)
+    await cache_set(SITEMAP_CACHE_NAMESPACE, "rss.xml.gz", compressed, expire=SITEMAP_CACHE_TTL)
     
-    return Response(content=xml_content, media_type="application/xml")
+    return xml_response(request, compressed)
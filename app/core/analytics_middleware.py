@@ -1,58 +1,191 @@
 import time
 import asyncio
-from typing import Callable
+from typing import Callable, Mapping, Optional
+from functools import lru_cache
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 import logging
+from sqlalchemy import insert
 
 from ..core.database import SessionLocal
+from ..core.partitions import ensure_partitions, PARTITION_CHECK_INTERVAL
 from ..models.api_analytics import APIAnalytics
 from ..core.security import decode_token
 from ..core.geolocation import get_geolocation_from_ip
+from ..core.logger import api_logger
 
 logger = logging.getLogger(__name__)
 
+# Analytics records waiting to be written; drained in batches by analytics_flusher()
+ANALYTICS_QUEUE_SIZE = 10000
+ANALYTICS_BATCH_SIZE = 200
+ANALYTICS_FLUSH_INTERVAL = 1.0  # seconds
+
+# Paths that are never recorded
+SKIP_EXACT_PATHS = frozenset({"/docs", "/redoc", "/openapi.json", "/favicon.ico"})
+SKIP_PATH_PREFIXES = ("/static/", "/uploads/", "/docs/")
+
+analytics_queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=ANALYTICS_QUEUE_SIZE)
+
+
+@lru_cache(maxsize=4096)
+def _cached_decode(token: str) -> dict:
+    """Verify and decode a JWT once per distinct token"""
+    return decode_token(token)
+
+
+def _add_geolocation(record: dict, geo_data: Optional[dict]) -> dict:
+    """Attach geolocation fields to an analytics record"""
+    record.update(
+        country=geo_data.get("country") if geo_data else None,
+        country_code=geo_data.get("country_code") if geo_data else None,
+        region=geo_data.get("region") if geo_data else None,
+        city=geo_data.get("city") if geo_data else None,
+        latitude=geo_data.get("lat") if geo_data else None,
+        longitude=geo_data.get("lon") if geo_data else None,
+        timezone=geo_data.get("timezone") if geo_data else None
+    )
+    return record
+
+
+async def _geolocate_batch(records: list) -> list:
+    """Resolve geolocation off the request path, once per distinct IP in the batch"""
+    ips = list({r["ip_address"] for r in records if r.get("ip_address")})
+    results = await asyncio.gather(
+        *(get_geolocation_from_ip(ip) for ip in ips), return_exceptions=True
+    )
+    geo_by_ip = {ip: geo for ip, geo in zip(ips, results) if isinstance(geo, Mapping)}
+    return [_add_geolocation(r, geo_by_ip.get(r.get("ip_address"))) for r in records]
+
+
+def _store_analytics_batch(records: list):
+    """Insert a batch of analytics records in a single transaction"""
+    db = SessionLocal()
+    try:
+        # Core executemany; batched into multi-row INSERTs ("insertmanyvalues")
+        db.execute(insert(APIAnalytics), records)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to store {len(records)} analytics records: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _drain_queue() -> list:
+    """Take everything currently queued without waiting"""
+    records = []
+    while True:
+        try:
+            records.append(analytics_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return records
+
+
+async def analytics_flusher():
+    """
+    Background task that writes queued analytics records in batches.
+    
+    The synchronous database write always runs in a worker thread so it never
+    blocks the event loop.
+    
+    Flushes when ANALYTICS_BATCH_SIZE records are buffered or ANALYTICS_FLUSH_INTERVAL
+    has passed since the first buffered record. Remaining records are written on cancel.
+    Upcoming monthly partitions are re-checked every PARTITION_CHECK_INTERVAL, so a
+    long-running process never starts writing a month into the default partition.
+    """
+    loop = asyncio.get_running_loop()
+    buffer = []
+    next_partition_check = loop.time() + PARTITION_CHECK_INTERVAL  # Startup handles the first check
+    try:
+        while True:
+            buffer.append(await analytics_queue.get())
+            deadline = loop.time() + ANALYTICS_FLUSH_INTERVAL
+            
+            while len(buffer) < ANALYTICS_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    buffer.append(await asyncio.wait_for(analytics_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            batch, buffer = buffer, []
+            batch = await _geolocate_batch(batch)
+            if loop.time() >= next_partition_check:
+                await asyncio.to_thread(ensure_partitions)
+                next_partition_check = loop.time() + PARTITION_CHECK_INTERVAL
+            await asyncio.to_thread(_store_analytics_batch, batch)
+    except asyncio.CancelledError:
+        # Shutdown: write whatever is still buffered or queued
+        remaining = buffer + _drain_queue()
+        if remaining:
+            remaining = await _geolocate_batch(remaining)
+            await asyncio.to_thread(_store_analytics_batch, remaining)
+        raise
+
+
+def _request_analytics(request: Request) -> dict:
+    """Collect the analytics fields available before the request is handled (fast, synchronous)"""
+    # Try to get user ID from token (fast operation)
+    user_id = None
+    try:
+        auth_header = request.headers.get("authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            token = auth_header.split(" ")[1]
+            payload = _cached_decode(token)
+            # Cached payloads outlive the token, so check expiry here
+            if payload.get("exp", 0) > time.time():
+                user_id = int(payload.get("sub")) if payload.get("sub") else None
+    except Exception:
+        pass  # User not authenticated or invalid token
+    
+    # Get request size
+    request_size = None
+    if "content-length" in request.headers:
+        try:
+            request_size = int(request.headers["content-length"])
+        except ValueError:
+            pass
+    
+    return {
+        "endpoint": request.url.path,
+        "method": request.method,
+        "user_id": user_id,
+        "ip_address": request.client.host if request.client else None,
+        "user_agent": request.headers.get("user-agent"),
+        "request_size": request_size
+    }
+
 
 class AnalyticsMiddleware(BaseHTTPMiddleware):
-    """Middleware to track API analytics"""
+    """
+    Middleware to log requests and track API analytics.
+    
+    Every request is timed once; the response is logged to the api logger and,
+    when record_analytics is set, an analytics record is queued.
+    """
     
-    def __init__(self, app: ASGIApp):
+    def __init__(self, app: ASGIApp, record_analytics: bool = True):
         super().__init__(app)
+        self.record_analytics = record_analytics
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip analytics for certain paths
-        skip_paths = ["/docs", "/redoc", "/openapi.json", "/static", "/favicon.ico", "/uploads"]
-        if any(request.url.path.startswith(path) for path in skip_paths):
-            return await call_next(request)
-        
         # Record start time
-        start_time = time.time()
-        
-        # Get request details (fast, synchronous operations only)
+        start_time = time.perf_counter_ns()
         method = request.method
-        endpoint = request.url.path
-        user_agent = request.headers.get("user-agent")
-        ip_address = request.client.host if request.client else None
+        path = request.url.path
         
-        # Try to get user ID from token (fast operation)
-        user_id = None
-        try:
-            auth_header = request.headers.get("authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
-                payload = decode_token(token)
-                user_id = int(payload.get("sub")) if payload.get("sub") else None
-        except Exception:
-            pass  # User not authenticated or invalid token
+        # Log request (DEBUG only; messages are formatted only if a handler emits them)
+        if api_logger.isEnabledFor(logging.DEBUG):
+            api_logger.debug("→ %s %s", method, path)
         
-        # Get request size
-        request_size = None
-        if "content-length" in request.headers:
-            try:
-                request_size = int(request.headers["content-length"])
-            except ValueError:
-                pass
+        # Skip analytics for docs and static files
+        record = None
+        if self.record_analytics and not (path in SKIP_EXACT_PATHS or path.startswith(SKIP_PATH_PREFIXES)):
+            record = _request_analytics(request)
         
         # Process request (this is the main request handling)
         response = None
@@ -64,87 +197,40 @@ class AnalyticsMiddleware(BaseHTTPMiddleware):
             status_code = response.status_code
         except Exception as e:
             error_message = str(e)
-            logger.error(f"Error processing request {method} {endpoint}: {e}")
+            duration_ms = (time.perf_counter_ns() - start_time) / 1e6
+            api_logger.error("✗ %s %s - Error: %s (%.3fms)", method, path, e, duration_ms)
             raise  # Re-raise to let FastAPI handle it
         finally:
             # Calculate response time
-            end_time = time.time()
-            response_time_ms = (end_time - start_time) * 1000
+            response_time_ms = (time.perf_counter_ns() - start_time) / 1e6
             
-            # Get response size
-            response_size = None
-            if response and "content-length" in response.headers:
-                try:
-                    response_size = int(response.headers["content-length"])
-                except ValueError:
-                    pass
+            # Log response (non-blocking)
+            if response is not None and api_logger.isEnabledFor(logging.INFO):
+                api_logger.info("← %s %s - %d (%.3fms)", method, path, status_code, response_time_ms)
             
-            # Store analytics asynchronously (fire-and-forget, doesn't block response)
-            try:
-                asyncio.create_task(
-                    self._store_analytics(
-                        endpoint=endpoint,
-                        method=method,
-                        status_code=status_code,
-                        response_time_ms=response_time_ms,
-                        user_id=user_id,
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        request_size=request_size,
-                        response_size=response_size,
-                        error_message=error_message
-                    )
+            if record is not None:
+                # Get response size
+                response_size = None
+                if response and "content-length" in response.headers:
+                    try:
+                        response_size = int(response.headers["content-length"])
+                    except ValueError:
+                        pass
+                
+                # Queue analytics for the batched writer (never blocks the response)
+                record.update(
+                    status_code=status_code,
+                    response_time_ms=response_time_ms,
+                    response_size=response_size,
+                    error_message=error_message
                 )
-            except Exception as e:
-                # Never let analytics errors affect the response
-                logger.error(f"Failed to create analytics task: {e}")
+                try:
+                    analytics_queue.put_nowait(record)
+                except asyncio.QueueFull:
+                    # Drop the record rather than slow down requests
+                    logger.warning("Analytics queue full, dropping record")
+                except Exception as e:
+                    # Never let analytics errors affect the response
+                    logger.error(f"Failed to queue analytics record: {e}")
         
         return response
-    
-    async def _store_analytics(
-        self,
-        endpoint: str,
-        method: str,
-        status_code: int,
-        response_time_ms: float,
-        user_id: int = None,
-        ip_address: str = None,
-        user_agent: str = None,
-        request_size: int = None,
-        response_size: int = None,
-        error_message: str = None
-    ):
-        """Store analytics data in database (runs asynchronously, doesn't block requests)"""
-        db = SessionLocal()
-        try:
-            # Get geolocation data here (after response is sent)
-            geo_data = None
-            if ip_address:
-                geo_data = get_geolocation_from_ip(ip_address)
-            
-            analytics = APIAnalytics(
-                endpoint=endpoint,
-                method=method,
-                status_code=status_code,
-                response_time_ms=response_time_ms,
-                user_id=user_id,
-                ip_address=ip_address,
-                country=geo_data.get("country") if geo_data else None,
-                country_code=geo_data.get("country_code") if geo_data else None,
-                region=geo_data.get("region") if geo_data else None,
-                city=geo_data.get("city") if geo_data else None,
-                latitude=geo_data.get("lat") if geo_data else None,
-                longitude=geo_data.get("lon") if geo_data else None,
-                timezone=geo_data.get("timezone") if geo_data else None,
-                user_agent=user_agent,
-                request_size=request_size,
-                response_size=response_size,
-                error_message=error_message
-            )
-            db.add(analytics)
-            db.commit()
-        except Exception as e:
-            logger.error(f"Failed to store analytics: {e}")
-            db.rollback()
-        finally:
-            db.close()
@@ -0,0 +1,124 @@
+import logging
+from typing import Dict, Optional
+
+from .config import settings
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Redis is optional; caching is skipped without it
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+# Namespace for /sitemap.xml and /rss.xml; cleared whenever blogs or courses change
+SITEMAP_CACHE_NAMESPACE = "sitemap"
+
+# Serialized GET /courses/{slug} bodies, keyed by course id and content version
+COURSE_CACHE_NAMESPACE = "course"
+
+# Serialized GET /api/branding/settings body; cleared whenever branding changes
+BRANDING_CACHE_NAMESPACE = "branding"
+
+
+def get_redis():
+    """Get the shared Redis client, or None if Redis is not available"""
+    global _client
+    if redis is None:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,  # Fail fast to a cache miss if Redis is down
+            socket_timeout=0.5
+        )
+    return _client
+
+
+async def cache_get(namespace: str, key: str) -> Optional[bytes]:
+    """Get a cached value; returns None on a miss or if Redis is unreachable"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(f"{namespace}:{key}")
+    except Exception as e:
+        logger.warning(f"Cache get failed for {namespace}:{key}: {e}")
+        return None
+
+
+async def cache_set(namespace: str, key: str, value, expire: int) -> None:
+    """Cache a value for `expire` seconds; failures are logged and ignored"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(f"{namespace}:{key}", value, ex=expire)
+    except Exception as e:
+        logger.warning(f"Cache set failed for {namespace}:{key}: {e}")
+
+
+async def cache_hset(namespace: str, key: str, field: str, value: str, expire: int) -> bool:
+    """Set one field of a cached hash and refresh its TTL; returns False if Redis is unavailable"""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        async with client.pipeline(transaction=True) as pipe:
+            await pipe.hset(f"{namespace}:{key}", field, value).expire(f"{namespace}:{key}", expire).execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Cache hset failed for {namespace}:{key}: {e}")
+        return False
+
+
+async def cache_hgetall(namespace: str, key: str, strict: bool = False) -> Dict[str, str]:
+    """
+    Get all fields of a cached hash; empty on a miss or if Redis is not configured.
+    A Redis error also returns empty, unless strict is set, in which case it is raised
+    (for callers whose hash holds data rather than a cache).
+    """
+    client = get_redis()
+    if client is None:
+        return {}
+    try:
+        data = await client.hgetall(f"{namespace}:{key}")
+        return {k.decode(): v.decode() for k, v in data.items()}
+    except Exception as e:
+        logger.warning(f"Cache hgetall failed for {namespace}:{key}: {e}")
+        if strict:
+            raise
+        return {}
+
+
+async def cache_delete(namespace: str, key: str) -> None:
+    """Delete a single cached value"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.delete(f"{namespace}:{key}")
+    except Exception as e:
+        logger.warning(f"Cache delete failed for {namespace}:{key}: {e}")
+
+
+async def cache_clear(namespace: str) -> None:
+    """Delete every cached value in a namespace"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        keys = [key async for key in client.scan_iter(match=f"{namespace}:*")]
+        if keys:
+            await client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Cache clear failed for namespace {namespace}: {e}")
+
+
+async def close_cache() -> None:
+    """Close the Redis connection pool on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,5 +1,6 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
+from functools import cached_property
 import os
 
 
@@ -17,6 +18,10 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = ""
+    AUTO_CREATE_TABLES: bool = True  # create_all on startup; disable once an Alembic baseline manages the schema
+    # Per worker process: workers x (pool size + overflow) must stay below Postgres max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
     
     def get_database_url(self) -> str:
         """Return appropriate database URL based on environment"""
@@ -37,9 +42,16 @@ class Settings(BaseSettings):
     FRONTEND_URL: str = "http://localhost:5173"
     ALLOWED_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
     
+    # Uploaded files are served by the app unless a front server handles /uploads/
+    SERVE_UPLOADS: bool = True
+    
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # IP geolocation for API analytics (ip-api.com)
+    GEOLOCATION_ENABLED: bool = False
+    GEOLITE2_DB_PATH: str = ""  # Path to GeoLite2-City.mmdb; uses ip-api.com when empty
+    
     # Stripe
     STRIPE_SECRET_KEY: str
     STRIPE_PUBLISHABLE_KEY: str
@@ -70,13 +82,11 @@ class Settings(BaseSettings):
     ADMIN_PASSWORD: str = "Admin@123456"
     ADMIN_FULL_NAME: str = "System Administrator"
     
-    @property
+    @cached_property
     def allowed_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 
 settings = Settings()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import DDL, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
@@ -6,27 +6,60 @@ from .config import settings
 # Get database URL based on environment
 database_url = settings.get_database_url()
 
+# PostgreSQL goes through psycopg 3, which prepares a statement server-side once it
+# has run prepare_threshold times on a connection (later runs skip parse/plan)
+if database_url.startswith(("postgresql://", "postgres://")):
+    database_url = "postgresql+psycopg://" + database_url.split("://", 1)[1]
+
 # Create database engine
 # SQLite requires different connection arguments
 if database_url.startswith("sqlite"):
     engine = create_engine(
         database_url,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        query_cache_size=1200
     )
+
+    # ON DELETE CASCADE clauses are only enforced with foreign keys switched on
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
 else:
     engine = create_engine(
         database_url,
         pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=20
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=1800,  # Replace connections before server/proxy idle timeouts
+        pool_timeout=10,  # Fail fast instead of queueing requests on an exhausted pool
+        pool_use_lifo=True,  # Reuse the most recent (warm) connection first
+        connect_args={
+            "options": "-c statement_timeout=30000",  # 30s cap per statement
+            "prepare_threshold": 5  # Set to None behind a transaction-mode pgbouncer
+        },
+        query_cache_size=1200
     )
 
+# Whether relationships may leave child deletes to the database's ON DELETE CASCADE.
+# The migration adding those clauses is PostgreSQL-only, so SQLite dev databases created
+# before it lack them; there the ORM keeps loading and deleting child rows itself.
+PASSIVE_DELETES = not database_url.startswith("sqlite")
+
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps loaded attributes valid after commit instead of re-SELECTing them
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 
 # Create Base class for models
 Base = declarative_base()
 
+# Trigram indexes used by title/description search need pg_trgm before create_all builds them
+event.listen(
+    Base.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 
 # Dependency to get DB session
 def get_db():
@@ -1,99 +1,33 @@
-from typing import List, Optional
-import smtplib
+from typing import List, Optional, Tuple
+from functools import lru_cache
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
+from email.utils import formataddr
 import asyncio
+import ssl
+import time
 from pathlib import Path
 import logging
 
+import aiosmtplib
+
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# SMTP connection pool limits
+SMTP_MAX_CONNECTIONS = 4
+SMTP_MESSAGES_PER_CONNECTION = 100  # Reconnect after this many messages
+SMTP_IDLE_TIMEOUT = 30  # Seconds before an idle connection is checked with NOOP
 
-class EmailService:
-    """Service for sending emails via SMTP"""
-    
-    def __init__(self):
-        self.smtp_host = settings.SMTP_HOST
-        self.smtp_port = settings.SMTP_PORT
-        self.smtp_user = settings.SMTP_USER
-        self.smtp_password = settings.SMTP_PASSWORD
-        self.from_email = settings.FROM_EMAIL
-        self.from_name = settings.FROM_NAME or "LMS Platform"
-    
-    def _create_message(
-        self,
-        to_email: str,
-        subject: str,
-        html_content: str,
-        text_content: Optional[str] = None
-    ) -> MIMEMultipart:
-        """Create email message"""
-        message = MIMEMultipart("alternative")
-        message["From"] = f"{self.from_name} <{self.from_email}>"
-        message["To"] = to_email
-        message["Subject"] = subject
-        
-        # Add text version if provided
-        if text_content:
-            part1 = MIMEText(text_content, "plain")
-            message.attach(part1)
-        
-        # Add HTML version
-        part2 = MIMEText(html_content, "html")
-        message.attach(part2)
-        
-        return message
-    
-    async def send_email_async(
-        self,
-        to_email: str,
-        subject: str,
-        html_content: str,
-        text_content: Optional[str] = None
-    ) -> bool:
-        """Send email asynchronously"""
-        try:
-            # Run blocking SMTP operation in thread pool
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self._send_email_sync,
-                to_email,
-                subject,
-                html_content,
-                text_content
-            )
-            logger.info(f"Email sent successfully to {to_email}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {str(e)}")
-            return False
-    
-    def _send_email_sync(
-        self,
-        to_email: str,
-        subject: str,
-        html_content: str,
-        text_content: Optional[str] = None
-    ):
-        """Synchronous email sending (called in thread pool)"""
-        message = self._create_message(to_email, subject, html_content, text_content)
-        
-        # Connect to SMTP server and send
-        with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-            server.starttls()  # Enable TLS
-            server.login(self.smtp_user, self.smtp_password)
-            server.send_message(message)
-    
-    async def send_welcome_email(self, to_email: str, full_name: str) -> bool:
-        """Send welcome email after registration"""
-        subject = f"Welcome to {self.from_name}! 🎉"
-        
-        html_content = f"""
+# Built once; loading the CA bundle is expensive
+SMTP_TLS_CONTEXT = ssl.create_default_context()
+
+
+# Email templates, formatted with str.format (literal braces are doubled)
+WELCOME_HTML_TEMPLATE = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -166,7 +100,7 @@ class EmailService:
                 </div>
                 
                 <div style="text-align: center;">
-                    <a href="{settings.FRONTEND_URL}/courses" class="button">Explore Courses</a>
+                    <a href="{frontend_url}/courses" class="button">Explore Courses</a>
                 </div>
                 
                 <p>If you have any questions or need assistance, our support team is always here to help.</p>
@@ -175,15 +109,15 @@ class EmailService:
                 The LMS Team</p>
             </div>
             <div class="footer">
-                <p>You received this email because you registered at {self.from_name}</p>
+                <p>You received this email because you registered at {from_name}</p>
                 <p>&copy; 2025 LMS Platform. All rights reserved.</p>
             </div>
         </body>
         </html>
         """
-        
-        text_content = f"""
-        Welcome to {self.from_name}!
+
+WELCOME_TEXT_TEMPLATE = """
+        Welcome to {from_name}!
         
         Hi {full_name},
         
@@ -198,22 +132,15 @@ class EmailService:
         - Earn certificates upon completion
         - Connect with fellow learners
         
-        Visit {settings.FRONTEND_URL}/courses to get started!
+        Visit {frontend_url}/courses to get started!
         
         If you have any questions or need assistance, our support team is always here to help.
         
         Happy Learning!
         The LMS Team
         """
-        
-        return await self.send_email_async(to_email, subject, html_content, text_content)
-    
-    async def send_password_reset_email(self, to_email: str, full_name: str, reset_token: str) -> bool:
-        """Send password reset email"""
-        reset_link = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
-        subject = "Reset Your Password - LMS"
-        
-        html_content = f"""
+
+PASSWORD_RESET_HTML_TEMPLATE = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -301,8 +228,8 @@ class EmailService:
         </body>
         </html>
         """
-        
-        text_content = f"""
+
+PASSWORD_RESET_TEXT_TEMPLATE = """
         Password Reset Request
         
         Hi {full_name},
@@ -322,19 +249,8 @@ class EmailService:
         Best regards,
         The LMS Team
         """
-        
-        return await self.send_email_async(to_email, subject, html_content, text_content)
-    
-    async def send_enrollment_confirmation_email(
-        self, 
-        to_email: str, 
-        full_name: str, 
-        course_title: str
-    ) -> bool:
-        """Send enrollment confirmation email"""
-        subject = f"Enrollment Confirmed: {course_title}"
-        
-        html_content = f"""
+
+ENROLLMENT_CONFIRMATION_HTML_TEMPLATE = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -400,7 +316,7 @@ class EmailService:
                 <p>You can now access all course materials and start learning right away!</p>
                 
                 <div style="text-align: center;">
-                    <a href="{settings.FRONTEND_URL}/dashboard" class="button">Go to Dashboard</a>
+                    <a href="{frontend_url}/dashboard" class="button">Go to Dashboard</a>
                 </div>
                 
                 <p>Happy Learning!<br>
@@ -412,8 +328,8 @@ class EmailService:
         </body>
         </html>
         """
-        
-        text_content = f"""
+
+ENROLLMENT_CONFIRMATION_TEXT_TEMPLATE = """
         Enrollment Confirmed!
         
         Hi {full_name},
@@ -423,13 +339,309 @@ class EmailService:
         
         You can now access all course materials and start learning right away!
         
-        Visit {settings.FRONTEND_URL}/dashboard to get started.
+        Visit {frontend_url}/dashboard to get started.
         
         Happy Learning!
         The LMS Team
         """
+
+
+# Bump when a cached template changes so stale renders are not reused
+TEMPLATE_VERSION = 1
+
+EMAIL_TEMPLATES = {
+    "welcome": (WELCOME_HTML_TEMPLATE, WELCOME_TEXT_TEMPLATE),
+    "enrollment_confirmation": (ENROLLMENT_CONFIRMATION_HTML_TEMPLATE, ENROLLMENT_CONFIRMATION_TEXT_TEMPLATE),
+}
+
+
+def build_message(
+    from_header: str,
+    to_email: Optional[str],
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None
+) -> MIMEMultipart:
+    """Build a multipart/alternative message; To is omitted when to_email is None"""
+    message = MIMEMultipart("alternative")
+    message["From"] = from_header
+    if to_email is not None:
+        message["To"] = to_email
+    message["Subject"] = subject
+    
+    # Add text version if provided
+    if text_content:
+        part1 = MIMEText(text_content, "plain")
+        message.attach(part1)
+    
+    # Add HTML version
+    part2 = MIMEText(html_content, "html")
+    message.attach(part2)
+    
+    return message
+
+
+@lru_cache(maxsize=1024)
+def render_template_message(
+    version: int,
+    template_id: str,
+    from_header: str,
+    subject: str,
+    variables: Tuple[Tuple[str, str], ...]
+) -> bytes:
+    """
+    Render a template into serialized message bytes without a To header.
+    Cached, so identical emails (e.g. one course's confirmations) are built once.
+    """
+    html_template, text_template = EMAIL_TEMPLATES[template_id]
+    kwargs = dict(variables)
+    return render_message(
+        from_header, subject, html_template.format(**kwargs), text_template.format(**kwargs)
+    )
+
+
+def render_message(
+    from_header: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None
+) -> bytes:
+    """Serialize a message without a To header (memoized via render_template_message)"""
+    return build_message(from_header, None, subject, html_content, text_content).as_bytes()
+
+
+def address_message(to_email: str, body: bytes) -> bytes:
+    """Add the To header to a message serialized by render_message"""
+    return f"To: {to_email}\n".encode() + body
+
+
+class _PooledConnection:
+    """An authenticated SMTP client plus its usage counters"""
+    
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SmtpPool:
+    """
+    Bounded pool of connected, authenticated SMTP clients.
+    
+    Clients are created on demand (up to max_connections), reused for up to
+    messages_per_connection messages, and checked with NOOP when they have
+    been idle so that server-side timeouts are detected before sending.
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        max_connections: int = SMTP_MAX_CONNECTIONS,
+        messages_per_connection: int = SMTP_MESSAGES_PER_CONNECTION,
+        idle_timeout: float = SMTP_IDLE_TIMEOUT
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_connections = max_connections
+        self.messages_per_connection = messages_per_connection
+        self.idle_timeout = idle_timeout
+        self._slots: Optional[asyncio.Queue] = None
+    
+    def _get_slots(self) -> asyncio.Queue:
+        # Created lazily so the queue belongs to the running event loop;
+        # an empty slot (None) means a connection may be opened
+        if self._slots is None:
+            self._slots = asyncio.Queue()
+            for _ in range(self.max_connections):
+                self._slots.put_nowait(None)
+        return self._slots
+    
+    async def _connect(self) -> _PooledConnection:
+        client = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            start_tls=True,  # Explicit STARTTLS (port 587)
+            tls_context=SMTP_TLS_CONTEXT
+        )
+        await client.connect()
+        if self.username:
+            await client.login(self.username, self.password)
+        return _PooledConnection(client)
+    
+    async def _close(self, conn: _PooledConnection) -> None:
+        try:
+            await conn.client.quit()
+        except Exception:
+            conn.client.close()
+    
+    async def _acquire(self) -> _PooledConnection:
+        conn = await self._get_slots().get()
+        try:
+            if conn is not None and time.monotonic() - conn.last_used > self.idle_timeout:
+                try:
+                    await conn.client.noop()
+                except Exception:
+                    conn.client.close()
+                    conn = None
+            if conn is None or not conn.client.is_connected:
+                conn = await self._connect()
+            return conn
+        except Exception:
+            # Give the slot back so a failed connect doesn't shrink the pool
+            self._get_slots().put_nowait(None)
+            raise
+    
+    async def _release(self, conn: Optional[_PooledConnection]) -> None:
+        if conn is not None and conn.messages_sent >= self.messages_per_connection:
+            await self._close(conn)
+            conn = None
+        self._get_slots().put_nowait(conn)
+    
+    async def sendmail(self, sender: str, recipients: List[str], raw_message: bytes) -> None:
+        """Send an already-serialized message over a pooled connection"""
+        conn = await self._acquire()
+        try:
+            await conn.client.sendmail(sender, recipients, raw_message)
+            conn.messages_sent += 1
+            conn.last_used = time.monotonic()
+        except Exception:
+            # Don't reuse a connection in an unknown state
+            conn.client.close()
+            conn = None
+            raise
+        finally:
+            await self._release(conn)
+    
+    async def close(self) -> None:
+        """Close all idle pooled connections (called on application shutdown)"""
+        if self._slots is None:
+            return
+        while not self._slots.empty():
+            conn = self._slots.get_nowait()
+            if conn is not None:
+                await self._close(conn)
+        self._slots = None
+
+
+class EmailService:
+    """Service for sending emails via SMTP"""
+    
+    def __init__(self):
+        self.smtp_host = settings.SMTP_HOST
+        self.smtp_port = settings.SMTP_PORT
+        self.smtp_user = settings.SMTP_USER
+        self.smtp_password = settings.SMTP_PASSWORD
+        self.from_email = settings.FROM_EMAIL
+        self.from_name = settings.FROM_NAME or "LMS Platform"
+        # Built once; formataddr quotes/encodes display names that need it
+        self.from_header = formataddr((self.from_name, self.from_email))
+        self.pool = SmtpPool(self.smtp_host, self.smtp_port, self.smtp_user, self.smtp_password)
+    
+    def _create_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> bytes:
+        """Create a serialized one-off email message (not cached: bodies such as reset links are per recipient)"""
+        return build_message(self.from_header, to_email, subject, html_content, text_content).as_bytes()
+    
+    async def send_email_async(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> bool:
+        """Send email asynchronously over a pooled SMTP connection"""
+        try:
+            raw_message = self._create_message(to_email, subject, html_content, text_content)
+            await self.pool.sendmail(self.from_email, [to_email], raw_message)
+            logger.info(f"Email sent successfully to {to_email}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email to {to_email}: {str(e)}")
+            return False
+    
+    async def send_template_async(
+        self,
+        to_email: str,
+        template_id: str,
+        subject: str,
+        **variables: str
+    ) -> bool:
+        """Send a cached template render, adding only the recipient header"""
+        try:
+            body = render_template_message(
+                TEMPLATE_VERSION, template_id, self.from_header,
+                subject, tuple(sorted(variables.items()))
+            )
+            raw_message = address_message(to_email, body)
+            await self.pool.sendmail(self.from_email, [to_email], raw_message)
+            logger.info(f"Email sent successfully to {to_email}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email to {to_email}: {str(e)}")
+            return False
+    
+    async def send_welcome_email(
+        self,
+        to_email: str,
+        full_name: str
+    ) -> bool:
+        """Send welcome email after registration"""
+        subject = f"Welcome to {self.from_name}! 🎉"
+        
+        return await self.send_template_async(
+            to_email, "welcome", subject,
+            from_name=self.from_name,
+            frontend_url=settings.FRONTEND_URL,
+            full_name=full_name
+        )
+    
+    async def send_password_reset_email(
+        self,
+        to_email: str,
+        full_name: str,
+        reset_token: str
+    ) -> bool:
+        """Send password reset email"""
+        reset_link = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
+        subject = "Reset Your Password - LMS"
+        
+        html_content = PASSWORD_RESET_HTML_TEMPLATE.format(
+            full_name=full_name,
+            reset_link=reset_link
+        )
+        
+        text_content = PASSWORD_RESET_TEXT_TEMPLATE.format(
+            full_name=full_name,
+            reset_link=reset_link
+        )
         
         return await self.send_email_async(to_email, subject, html_content, text_content)
+    
+    async def send_enrollment_confirmation_email(
+        self, 
+        to_email: str, 
+        full_name: str, 
+        course_title: str
+    ) -> bool:
+        """Send enrollment confirmation email"""
+        subject = f"Enrollment Confirmed: {course_title}"
+        
+        return await self.send_template_async(
+            to_email, "enrollment_confirmation", subject,
+            course_title=course_title,
+            frontend_url=settings.FRONTEND_URL,
+            full_name=full_name
+        )
 
 
 # Create global email service instance
@@ -1,40 +1,182 @@
+import ipaddress
 import logging
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
+
+import httpx
+from cachetools import TTLCache
+
+try:
+    import maxminddb
+except ImportError:  # Optional; without it lookups use ip-api.com
+    maxminddb = None
+
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
-# Cache for IP geolocation data to avoid excessive API calls
-_geolocation_cache: Dict[str, Dict[str, Any]] = {}
+# Bounded cache for IP geolocation data, keyed by packed IP bytes (4 bytes for IPv4, 16 for IPv6)
+_geolocation_cache: TTLCache = TTLCache(maxsize=100_000, ttl=24 * 3600)
+_cache_hits = 0
+_cache_misses = 0
 
+# Shared client so repeat lookups reuse the keep-alive connection to ip-api.com
+_client: Optional[httpx.AsyncClient] = None
 
-def get_geolocation_from_ip(ip_address: str) -> Optional[Dict[str, Any]]:
-    """
-    Get geolocation data from IP address using ip-api.com (free, no key required)
+# Memory-mapped GeoLite2 reader (False once opening has failed)
+_geolite2_reader = None
+
+# Returned when lookups are disabled or the IP is private/loopback (read-only, shared)
+LOCAL_GEOLOCATION = MappingProxyType({
+    "country": "Local",
+    "country_code": "LOCAL",
+    "region": "Local",
+    "city": "Local",
+    "lat": 0.0,
+    "lon": 0.0,
+    "timezone": "UTC"
+})
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url="http://ip-api.com",
+            timeout=2.0,
+            limits=httpx.Limits(max_keepalive_connections=10)
+        )
+    return _client
+
+
+def _get_geolite2_reader():
+    """Open the GeoLite2 database once (memory-mapped); None if not configured or unavailable"""
+    global _geolite2_reader
+    if _geolite2_reader is None and maxminddb is not None and settings.GEOLITE2_DB_PATH:
+        try:
+            _geolite2_reader = maxminddb.open_database(settings.GEOLITE2_DB_PATH, maxminddb.MODE_MMAP)
+        except Exception as e:
+            logger.warning(f"Could not open GeoLite2 database {settings.GEOLITE2_DB_PATH}: {e}")
+            _geolite2_reader = False  # Don't retry on every lookup
+    return _geolite2_reader or None
+
+
+def _lookup_geolite2(reader, ip_address: str) -> Mapping[str, Any]:
+    """Look up an IP in the local GeoLite2-City database"""
+    record = reader.get(ip_address)
+    if not record:
+        return LOCAL_GEOLOCATION
     
+    location = record.get("location", {})
+    subdivisions = record.get("subdivisions") or [{}]
+    return {
+        "country": record.get("country", {}).get("names", {}).get("en"),
+        "country_code": record.get("country", {}).get("iso_code"),
+        "region": subdivisions[0].get("names", {}).get("en"),
+        "city": record.get("city", {}).get("names", {}).get("en"),
+        "lat": location.get("latitude"),
+        "lon": location.get("longitude"),
+        "timezone": location.get("time_zone")
+    }
+
+
+async def _lookup_ip_api(ip_address: str) -> Optional[Mapping[str, Any]]:
+    """Look up an IP with the ip-api.com HTTP API (rate limited; fallback when GeoLite2 is not configured)"""
+    try:
+        response = await _get_client().get(
+            f"/json/{ip_address}",
+            params={"fields": "status,country,countryCode,regionName,city,lat,lon,timezone"}
+        )
+        data = response.json()
+    except Exception as e:
+        logger.warning(f"Geolocation lookup failed for {ip_address}: {e}")
+        return None
+
+    if data.get("status") != "success":
+        # Private and reserved ranges are reported as failures
+        return LOCAL_GEOLOCATION
+
+    return {
+        "country": data.get("country"),
+        "country_code": data.get("countryCode"),
+        "region": data.get("regionName"),
+        "city": data.get("city"),
+        "lat": data.get("lat"),
+        "lon": data.get("lon"),
+        "timezone": data.get("timezone")
+    }
+
+
+async def get_geolocation_from_ip(ip_address: str) -> Optional[Mapping[str, Any]]:
+    """
+    Get geolocation data from IP address using the local GeoLite2 database
+    (GEOLITE2_DB_PATH), falling back to ip-api.com (free, no key required)
+
     Returns dict with: country, country_code, region, city, lat, lon, timezone
     Returns None if lookup fails
-    
-    TEMPORARILY DISABLED: Returns local data to avoid blocking requests
+
+    Lookups only run when GEOLOCATION_ENABLED is set; otherwise local data is returned
     """
-    # Always return local data to avoid blocking - geolocation disabled for now
-    return {
-        "country": "Local",
-        "country_code": "LOCAL",
-        "region": "Local",
-        "city": "Local",
-        "lat": 0.0,
-        "lon": 0.0,
-        "timezone": "UTC"
-    }
+    if not settings.GEOLOCATION_ENABLED:
+        return LOCAL_GEOLOCATION
+
+    global _cache_hits, _cache_misses
+    
+    try:
+        addr = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return None
+    
+    # Internal traffic can't be geolocated; skip the futile HTTP call
+    if addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved:
+        return LOCAL_GEOLOCATION
+    
+    cache_key = addr.packed
+    
+    geo_data = _geolocation_cache.get(cache_key)
+    if geo_data is not None:
+        _cache_hits += 1
+        return geo_data
+    _cache_misses += 1
+
+    reader = _get_geolite2_reader()
+    if reader is not None:
+        geo_data = _lookup_geolite2(reader, ip_address)
+    else:
+        geo_data = await _lookup_ip_api(ip_address)
+    
+    if geo_data is None:
+        return None
+    
+    _geolocation_cache[cache_key] = geo_data
+    return geo_data
+
+
+async def close_geolocation_client():
+    """Close the shared HTTP client and GeoLite2 reader (called on application shutdown)"""
+    global _client, _geolite2_reader
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _geolite2_reader:
+        _geolite2_reader.close()
+    _geolite2_reader = None
 
 
 def clear_geolocation_cache():
     """Clear the geolocation cache (useful for testing or periodic cleanup)"""
-    global _geolocation_cache
+    global _cache_hits, _cache_misses
+    logger.info(f"Geolocation cache cleared ({_cache_hits} hits, {_cache_misses} misses)")
     _geolocation_cache.clear()
-    logger.info("Geolocation cache cleared")
+    _cache_hits = 0
+    _cache_misses = 0
 
 
 def get_cache_size() -> int:
     """Get the number of cached geolocation entries"""
     return len(_geolocation_cache)
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Get geolocation cache size and hit/miss counters"""
+    return {"size": len(_geolocation_cache), "hits": _cache_hits, "misses": _cache_misses}
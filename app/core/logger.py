@@ -1,22 +1,32 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
-from datetime import datetime
-import json
-from typing import Optional
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+import orjson
+from sqlalchemy import insert
+from typing import List, Optional
 from ..core.database import SessionLocal
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = Path(__file__).parent.parent.parent / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
+# Extra record attributes copied into structured log output when present
+# (extras passed to a logger call are stored in record.__dict__)
+LOG_EXTRA_FIELDS = ("user_id", "ip_address", "endpoint", "method", "status_code", "duration")
+DB_LOG_EXTRA_FIELDS = ("user_id", "endpoint", "method")
+
+
 # Custom JSON formatter for structured logging
 class JSONFormatter(logging.Formatter):
     def format(self, record):
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # record.created is already computed by logging; no extra clock read
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -30,20 +40,13 @@ class JSONFormatter(logging.Formatter):
             log_data["exception"] = self.formatException(record.exc_info)
         
         # Add extra fields if present
-        if hasattr(record, "user_id"):
-            log_data["user_id"] = record.user_id
-        if hasattr(record, "ip_address"):
-            log_data["ip_address"] = record.ip_address
-        if hasattr(record, "endpoint"):
-            log_data["endpoint"] = record.endpoint
-        if hasattr(record, "method"):
-            log_data["method"] = record.method
-        if hasattr(record, "status_code"):
-            log_data["status_code"] = record.status_code
-        if hasattr(record, "duration"):
-            log_data["duration"] = record.duration
+        record_dict = record.__dict__
+        for field in LOG_EXTRA_FIELDS:
+            value = record_dict.get(field)
+            if value is not None:
+                log_data[field] = value
             
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str).decode("utf-8")
 
 
 # Configure loggers
@@ -69,7 +72,8 @@ def setup_logger(name: str, level=logging.INFO):
     file_handler = RotatingFileHandler(
         LOGS_DIR / f"{name}.log",
         maxBytes=10485760,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Open the file on first write, not at import
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(JSONFormatter())
@@ -78,7 +82,8 @@ def setup_logger(name: str, level=logging.INFO):
     error_handler = RotatingFileHandler(
         LOGS_DIR / f"{name}_error.log",
         maxBytes=10485760,
-        backupCount=5
+        backupCount=5,
+        delay=True
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(JSONFormatter())
@@ -107,7 +112,7 @@ def log_api_request(endpoint: str, method: str, user_id: Optional[int] = None, i
         "user_id": user_id,
         "ip_address": ip_address
     }
-    api_logger.info(f"{method} {endpoint}", extra=extra)
+    api_logger.info("%s %s", method, endpoint, extra=extra)
 
 
 def log_api_response(endpoint: str, method: str, status_code: int, duration: float, user_id: Optional[int] = None):
@@ -119,81 +124,143 @@ def log_api_response(endpoint: str, method: str, status_code: int, duration: flo
         "duration": duration,
         "user_id": user_id
     }
-    api_logger.info(f"{method} {endpoint} - {status_code} ({duration:.3f}s)", extra=extra)
+    api_logger.info("%s %s - %s (%.3fs)", method, endpoint, status_code, duration, extra=extra)
 
 
 def log_error(error: Exception, context: str = "", user_id: Optional[int] = None):
     """Log error with context"""
     extra = {"user_id": user_id} if user_id else {}
-    error_logger.error(f"{context}: {str(error)}", exc_info=True, extra=extra)
+    error_logger.error("%s: %s", context, error, exc_info=True, extra=extra)
 
 
 def log_db_query(query: str, duration: float):
     """Log database query"""
-    db_logger.debug(f"Query executed in {duration:.3f}s: {query[:100]}...")
+    # Called per query; skip the slice entirely when DEBUG is filtered out
+    if db_logger.isEnabledFor(logging.DEBUG):
+        db_logger.debug("Query executed in %.3fs: %s...", duration, query[:100])
 
 
 def log_auth_event(event: str, user_id: Optional[int] = None, email: Optional[str] = None, success: bool = True):
     """Log authentication event"""
     extra = {"user_id": user_id}
     level = logging.INFO if success else logging.WARNING
-    message = f"Auth event: {event} - User: {email or user_id} - Success: {success}"
-    auth_logger.log(level, message, extra=extra)
+    auth_logger.log(level, "Auth event: %s - User: %s - Success: %s", event, email or user_id, success, extra=extra)
+
+
+# Database log rows are queued by the handler and written in batches by a background thread
+LOG_QUEUE_SIZE = 10_000
+LOG_BATCH_SIZE = 500
+LOG_FLUSH_INTERVAL = 1.0  # seconds
+
+_log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_log_writer: Optional[threading.Thread] = None
+_log_writer_lock = threading.Lock()
+_exception_formatter = logging.Formatter()
 
 
 # Store logs in database for admin viewing
-def store_log_in_db(level: str, message: str, logger_name: str, module: str = None, 
-                    function: str = None, user_id: int = None, extra_data: dict = None):
-    """Store important logs in database for admin viewing"""
+def store_logs_in_db(rows: List[dict]):
+    """Store a batch of important logs in database for admin viewing"""
     from ..models.log import Log
     
+    db = SessionLocal()
     try:
-        db = SessionLocal()
-        log_entry = Log(
-            level=level,
-            message=message,
-            logger=logger_name,
-            module=module,
-            function=function,
-            user_id=user_id,
-            extra_data=extra_data
-        )
-        db.add(log_entry)
+        # Core executemany; batched into multi-row INSERTs ("insertmanyvalues")
+        db.execute(insert(Log), rows)
         db.commit()
-        db.close()
     except Exception as e:
+        db.rollback()
         # Don't let logging errors crash the application
-        print(f"Failed to store log in database: {e}")
+        print(f"Failed to store {len(rows)} logs in database: {e}")
+    finally:
+        db.close()
+
+
+def _drain_log_queue(timeout: float) -> List[dict]:
+    """Wait up to `timeout` for a log row, then take whatever else is queued (up to a batch)"""
+    try:
+        rows = [_log_queue.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    while len(rows) < LOG_BATCH_SIZE:
+        try:
+            rows.append(_log_queue.get_nowait())
+        except queue.Empty:
+            break
+    return rows
+
+
+def _write_logs_forever():
+    while True:
+        rows = _drain_log_queue(LOG_FLUSH_INTERVAL)
+        if rows:
+            store_logs_in_db(rows)
+
+
+def _ensure_log_writer():
+    global _log_writer
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = threading.Thread(target=_write_logs_forever, name="db-log-writer", daemon=True)
+                _log_writer.start()
+
+
+def flush_log_queue():
+    """Write any queued log rows to the database (runs at interpreter exit)"""
+    while True:
+        rows = _drain_log_queue(0)
+        if not rows:
+            return
+        store_logs_in_db(rows)
+
+
+atexit.register(flush_log_queue)
 
 
 # Custom handler to store logs in database
 class DatabaseHandler(logging.Handler):
-    """Handler that stores logs in database"""
+    """Handler that queues logs for batched storage in database"""
     
     def emit(self, record):
         # Only store WARNING and above in database
         if record.levelno >= logging.WARNING:
             extra_data = {
                 "line": record.lineno,
-                "exception": self.format(record.exc_info) if record.exc_info else None
+                "exception": _exception_formatter.formatException(record.exc_info) if record.exc_info else None
+            }
+            
+            record_dict = record.__dict__
+            for field in DB_LOG_EXTRA_FIELDS:
+                value = record_dict.get(field)
+                if value is not None:
+                    extra_data[field] = value
+            
+            row = {
+                "level": record.levelname,
+                "message": record.getMessage(),
+                "logger": record.name,
+                "module": record.module,
+                "function": record.funcName,
+                "user_id": record_dict.get("user_id"),
+                "extra_data": extra_data,
+                # Keep the time the event happened, not when the batch was written
+                "created_at": datetime.fromtimestamp(record.created, timezone.utc)
             }
             
-            if hasattr(record, "user_id"):
-                extra_data["user_id"] = record.user_id
-            if hasattr(record, "endpoint"):
-                extra_data["endpoint"] = record.endpoint
-            if hasattr(record, "method"):
-                extra_data["method"] = record.method
-                
-            store_log_in_db(
-                level=record.levelname,
-                message=record.getMessage(),
-                logger_name=record.name,
-                module=record.module,
-                function=record.funcName,
-                user_id=getattr(record, "user_id", None),
-                extra_data=extra_data
-            )
+            _ensure_log_writer()
+            try:
+                _log_queue.put_nowait(row)
+            except queue.Full:
+                # Drop the oldest row rather than block the request
+                try:
+                    _log_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    _log_queue.put_nowait(row)
+                except queue.Full:
+                    pass
 
 
 # Add database handler to error logger
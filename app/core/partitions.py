@@ -0,0 +1,113 @@
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Tables range-partitioned by month on created_at (PostgreSQL, see the
+# partition_api_analytics and partition_logs migrations)
+PARTITIONED_TABLES = ("api_analytics", "logs")
+
+# Monthly partitions kept ready ahead of time
+PARTITION_MONTHS_AHEAD = 3
+
+# How often long-running processes re-check upcoming partitions (besides startup)
+PARTITION_CHECK_INTERVAL = 24 * 3600  # seconds
+
+
+def _next_month(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _is_partitioned(db: Session, table: str) -> bool:
+    """True if the table exists and is partitioned (relkind 'p') on PostgreSQL"""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    relkind = db.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+    return relkind == "p"
+
+
+def _create_partition(db: Session, table: str, month: date):
+    """
+    Create one monthly partition if it doesn't exist yet.
+
+    Rows for that month already sitting in the default partition would make
+    CREATE ... PARTITION OF fail, so the table is created detached, those rows are
+    moved into it, and it is then attached (which also builds its indexes).
+    """
+    name = f"{table}_{month:%Y_%m}"
+    if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return
+
+    next_month = _next_month(month)
+    db.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+    db.execute(text(
+        f"WITH moved AS (DELETE FROM {table}_default "
+        f"WHERE created_at >= '{month}' AND created_at < '{next_month}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ))
+    db.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{month}') TO ('{next_month}')"
+    ))
+
+
+def ensure_partitions(months_ahead: int = PARTITION_MONTHS_AHEAD):
+    """
+    Create this month's and the next months' partitions of each partitioned table if missing.
+
+    Called at startup and every PARTITION_CHECK_INTERVAL by the analytics flusher,
+    so new rows don't accumulate in the default partitions.
+    """
+    db = SessionLocal()
+    try:
+        for table in PARTITIONED_TABLES:
+            if not _is_partitioned(db, table):
+                continue
+
+            month = date.today().replace(day=1)
+            for _ in range(months_ahead + 1):
+                _create_partition(db, table, month)
+                month = _next_month(month)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to create partitions: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def drop_partitions_before(db: Session, table: str, cutoff: datetime) -> int:
+    """
+    Drop the monthly partitions of `table` that end on or before `cutoff`.
+
+    Returns the approximate number of rows removed, from the planner's row estimate
+    (an exact count would scan every dropped partition); the caller commits. Does
+    nothing unless the table is partitioned, so callers still DELETE whatever remains.
+    """
+    if not _is_partitioned(db, table):
+        return 0
+
+    partitions = db.execute(text(
+        "SELECT c.relname, c.reltuples FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table)"
+    ), {"table": table}).all()
+
+    removed = 0
+    for name, estimated_rows in partitions:
+        try:
+            month = datetime.strptime(name[len(table) + 1:], "%Y_%m").date()
+        except ValueError:
+            continue  # The default partition
+        if _next_month(month) > cutoff.date():
+            continue
+
+        removed += max(int(estimated_rows), 0)  # -1 if the partition was never analyzed
+        db.execute(text(f"DROP TABLE {name}"))
+    return removed
@@ -44,6 +44,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def user_token_claims(user) -> dict:
+    """Claims embedded in access tokens so role checks don't need a DB lookup."""
+    return {"sub": str(user.id), "role": user.role, "email": user.email}
+
+
 def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token."""
     to_encode = data.copy()
@@ -93,6 +98,61 @@ async def get_current_user(
     return user
 
 
+class TokenUser:
+    """Lightweight user identity built from verified access token claims."""
+    
+    def __init__(self, user_id: int, email: Optional[str], role: Optional[str]):
+        self.id = user_id
+        self.email = email
+        self.role = role
+
+
+async def get_token_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> TokenUser:
+    """Get the current user's identity from the token claims, without loading the user row."""
+    from ..models.user import User
+    
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    payload = decode_token(token)
+    user_id: str = payload.get("sub")
+    token_type: str = payload.get("type")
+    
+    if user_id is None or token_type != "access":
+        raise credentials_exception
+    
+    if "role" in payload:
+        return TokenUser(int(user_id), payload.get("email"), payload["role"])
+    
+    # Tokens issued before role claims were added: fall back to the database
+    user = db.query(User).filter(User.id == int(user_id)).first()
+    if user is None:
+        raise credentials_exception
+    
+    return TokenUser(user.id, user.email, user.role)
+
+
+async def get_token_admin_user(current_user: TokenUser = Depends(get_token_user)) -> TokenUser:
+    """Get current admin user from token claims (no DB round-trip for role-bearing tokens)."""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
+
+def is_admin(current_user: TokenUser = Depends(get_token_admin_user)) -> TokenUser:
+    """Admin check for the analytics and log endpoints (role is read from the access token claims)"""
+    return current_user
+
+
 async def get_current_active_user(current_user = Depends(get_current_user)):
     """Get current active user."""
     if not current_user.is_active:
@@ -1,11 +1,17 @@
-import secrets
+import base64
+import os
+import re
 from typing import Optional
 from datetime import datetime, timedelta
 
+# Compiled once for slugify
+_SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATOR_RE = re.compile(r'[\s_-]+')
 
-def generate_reset_token() -> str:
-    """Generate a secure random token for password reset."""
-    return secrets.token_urlsafe(32)
+
+def generate_reset_token(_urandom=os.urandom, _b64encode=base64.urlsafe_b64encode) -> str:
+    """Generate a secure random token for password reset (same as secrets.token_urlsafe(32))."""
+    return _b64encode(_urandom(32)).rstrip(b'=').decode('ascii')
 
 
 def create_reset_token_expiry() -> datetime:
@@ -20,9 +26,6 @@ def is_token_expired(expiry_time: datetime) -> bool:
 
 def slugify(text: str) -> str:
     """Convert text to URL-friendly slug."""
-    import re
-    text = text.lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s_-]+', '-', text)
-    text = re.sub(r'^-+|-+$', '', text)
-    return text
+    text = _SLUG_STRIP_RE.sub('', text.lower())
+    text = _SLUG_SEPARATOR_RE.sub('-', text)
+    return text.strip('-')
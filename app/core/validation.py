@@ -1,7 +1,41 @@
 import re
+import string
 from typing import Optional
+from urllib.parse import urlsplit
+from email_validator import validate_email as parse_email, EmailNotValidError
 from fastapi import HTTPException, status
 
+# Control characters removed by sanitize_string (newlines and tabs are kept)
+_CONTROL_CHARS = dict.fromkeys(i for i in range(32) if chr(i) not in '\n\r\t')
+
+# Patterns are compiled once at import
+_NAME_RE = re.compile(r'^[a-zA-Z\s\'-]+$')
+_TOKEN_RE = re.compile(r'^[a-zA-Z0-9\-]+$')
+_SEARCH_STRIP_RE = re.compile(r'[^\w\s\-.,!?\'"]')
+_OAUTH_RE = re.compile(r'^[a-zA-Z0-9\-_\.]+$')
+
+class _KeepOnly(dict):
+    """str.translate table that keeps its own keys and deletes every other character"""
+    
+    def __init__(self, allowed: str):
+        super().__init__((ord(char), ord(char)) for char in allowed)
+    
+    def __missing__(self, key):
+        return None
+
+
+# Characters kept by sanitize_coupon_code
+_COUPON_CHARS = _KeepOnly(string.ascii_uppercase + string.digits + '-_')
+
+# Password character classes, checked against the set of characters used
+_PWD_UPPER = frozenset(string.ascii_uppercase)
+_PWD_LOWER = frozenset(string.ascii_lowercase)
+_PWD_SPECIAL = frozenset('!@#$%^&*(),.?":{}|<>_-+=[]\\;/`~')
+_PWD_DIGIT_RE = re.compile(r'\d')
+
+# Characters allowed in a URL (RFC 3986 unreserved, reserved and percent sign)
+_URL_CHARS = frozenset(string.ascii_letters + string.digits + "-._~:/?#[]@!$&'()*+,;=%")
+
 
 def sanitize_string(value: str, max_length: int = 255) -> str:
     """
@@ -11,11 +45,8 @@ def sanitize_string(value: str, max_length: int = 255) -> str:
     if not value:
         return ""
     
-    # Remove null bytes
-    value = value.replace('\x00', '')
-    
-    # Remove control characters except newlines and tabs
-    value = ''.join(char for char in value if ord(char) >= 32 or char in '\n\r\t')
+    # Remove null bytes and control characters except newlines and tabs
+    value = value.translate(_CONTROL_CHARS)
     
     # Trim whitespace
     value = value.strip()
@@ -38,9 +69,10 @@ def validate_email(email: str) -> str:
     # Sanitize
     email = sanitize_string(email, max_length=255).lower()
     
-    # Validate email format
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
+    # Validate email format (a linear-time parser, no backtracking regex)
+    try:
+        email = parse_email(email, check_deliverability=False).normalized.lower()
+    except EmailNotValidError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid email format"
@@ -91,8 +123,7 @@ def validate_full_name(name: str) -> str:
         )
     
     # Check for valid characters (letters, spaces, hyphens, apostrophes)
-    name_pattern = r'^[a-zA-Z\s\'-]+$'
-    if not re.match(name_pattern, name):
+    if not _NAME_RE.match(name):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Full name can only contain letters, spaces, hyphens, and apostrophes"
@@ -101,56 +132,53 @@ def validate_full_name(name: str) -> str:
     return name
 
 
-def validate_password(password: str) -> None:
+def password_strength_error(password: str) -> Optional[str]:
     """
-    Validate password strength.
-    Raises HTTPException if password doesn't meet requirements.
+    Check password strength.
+    Returns the reason the password is rejected, or None if it meets requirements.
     """
     if not password:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password is required"
-        )
+        return "Password is required"
     
     # Check length
     if len(password) < 8:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must be at least 8 characters long"
-        )
+        return "Password must be at least 8 characters long"
     
     if len(password) > 128:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must not exceed 128 characters"
-        )
+        return "Password must not exceed 128 characters"
+    
+    # Each class check is a C-level set intersection test
+    chars = set(password)
     
     # Check for at least one uppercase letter
-    if not re.search(r'[A-Z]', password):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must contain at least one uppercase letter"
-        )
+    if chars.isdisjoint(_PWD_UPPER):
+        return "Password must contain at least one uppercase letter"
     
     # Check for at least one lowercase letter
-    if not re.search(r'[a-z]', password):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must contain at least one lowercase letter"
-        )
+    if chars.isdisjoint(_PWD_LOWER):
+        return "Password must contain at least one lowercase letter"
     
     # Check for at least one digit
-    if not re.search(r'\d', password):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must contain at least one number"
-        )
+    if not _PWD_DIGIT_RE.search(password):
+        return "Password must contain at least one number"
     
     # Check for at least one special character
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=\[\]\\;/`~]', password):
+    if chars.isdisjoint(_PWD_SPECIAL):
+        return "Password must contain at least one special character"
+    
+    return None
+
+
+def validate_password(password: str) -> None:
+    """
+    Validate password strength.
+    Raises HTTPException if password doesn't meet requirements.
+    """
+    error = password_strength_error(password)
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must contain at least one special character"
+            detail=error
         )
 
 
@@ -169,7 +197,7 @@ def sanitize_coupon_code(code: str) -> str:
     code = code.upper().strip()
     
     # Remove potentially dangerous characters
-    code = re.sub(r'[^A-Z0-9\-_]', '', code)
+    code = code.translate(_COUPON_CHARS)
     
     # Check length
     if len(code) < 3:
@@ -201,7 +229,7 @@ def validate_reset_token(token: str) -> str:
     token = token.strip()
     
     # Only allow alphanumeric characters and hyphens (typical UUID format)
-    if not re.match(r'^[a-zA-Z0-9\-]+$', token):
+    if not _TOKEN_RE.match(token):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid reset token format"
@@ -222,7 +250,7 @@ def sanitize_search_query(query: str, max_length: int = 100) -> str:
     
     # Remove SQL special characters that could be dangerous
     # Keep alphanumeric, spaces, and basic punctuation
-    query = re.sub(r'[^\w\s\-.,!?\'"]', '', query)
+    query = _SEARCH_STRIP_RE.sub('', query)
     
     return query.strip()
 
@@ -241,7 +269,7 @@ def validate_oauth_id(oauth_id: str, provider: str) -> str:
     oauth_id = sanitize_string(oauth_id, max_length=255)
     
     # Only allow alphanumeric and basic separators
-    if not re.match(r'^[a-zA-Z0-9\-_\.]+$', oauth_id):
+    if not _OAUTH_RE.match(oauth_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid OAuth ID format"
@@ -250,6 +278,30 @@ def validate_oauth_id(oauth_id: str, provider: str) -> str:
     return oauth_id
 
 
+def url_error(url: str, field_name: str = "URL") -> Optional[str]:
+    """
+    Check URL structure with urllib.parse (linear time, no regex).
+    Returns the reason the URL is rejected, or None if it is a valid HTTPS URL.
+    """
+    # Rejects whitespace, control characters and HTML-significant characters like " < >
+    if not _URL_CHARS.issuperset(url):
+        return f"Invalid {field_name} format"
+    
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return f"Invalid {field_name} format"
+    
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return f"Invalid {field_name} format"
+    
+    # Ensure it's https for security (optional but recommended)
+    if parts.scheme != "https":
+        return f"{field_name} must use HTTPS"
+    
+    return None
+
+
 def validate_url(url: Optional[str], field_name: str = "URL") -> Optional[str]:
     """
     Validate and sanitize URL (for avatar URLs, etc.).
@@ -260,19 +312,11 @@ def validate_url(url: Optional[str], field_name: str = "URL") -> Optional[str]:
     # Sanitize
     url = sanitize_string(url, max_length=500).strip()
     
-    # Basic URL validation
-    url_pattern = r'^https?://[a-zA-Z0-9\-._~:/?#\[\]@!$&\'()*+,;=%]+$'
-    if not re.match(url_pattern, url):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid {field_name} format"
-        )
-    
-    # Ensure it's https for security (optional but recommended)
-    if not url.startswith('https://'):
+    error = url_error(url, field_name)
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"{field_name} must use HTTPS"
+            detail=error
         )
     
     return url
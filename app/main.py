@@ -1,13 +1,16 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from contextlib import asynccontextmanager
 from pathlib import Path
-import time
+import asyncio
 
 from .core.config import settings
 from .core.database import engine, Base, SessionLocal
@@ -16,8 +19,13 @@ from .models.user import User
 from .models.blog import Blog  # Import Blog to ensure relationship is loaded
 from .models.log import Log  # Import Log model
 from .models.api_analytics import APIAnalytics  # Import APIAnalytics model
-from .core.logger import app_logger, api_logger, log_error
-from .core.analytics_middleware import AnalyticsMiddleware
+from .core.logger import app_logger, log_error
+from .core.analytics_middleware import AnalyticsMiddleware, analytics_flusher
+from .core.cache import close_cache
+from .core.partitions import ensure_partitions
+from .core.email_service import email_service
+from .core.geolocation import close_geolocation_client
+from .services.cloudflare import cloudflare_service
 from .api import auth, users, courses, enrollments, payments, admin, blogs, scorm, curriculum, cart_wishlist, coupons, logs, analytics, sitemap, branding
 
 
@@ -25,19 +33,23 @@ def create_admin_user():
     """Create admin user from environment variables if not exists"""
     db = SessionLocal()
     try:
-        # Check if admin exists
-        admin_user = db.query(User).filter(User.email == settings.ADMIN_EMAIL).first()
-        
-        if not admin_user:
-            # Create admin user
-            admin_user = User(
+        # One idempotent INSERT; safe when several workers start at once
+        insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        admin_id = db.execute(
+            insert(User).values(
                 email=settings.ADMIN_EMAIL,
                 full_name=settings.ADMIN_FULL_NAME,
-                hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
                 role="admin",
                 is_active=True
+            ).on_conflict_do_nothing(index_elements=["email"]).returning(User.id)
+        ).scalar()
+        
+        if admin_id is not None:
+            # Hash only for a new admin; the hash is deliberately slow
+            db.execute(
+                update(User).where(User.id == admin_id)
+                .values(hashed_password=get_password_hash(settings.ADMIN_PASSWORD))
             )
-            db.add(admin_user)
             db.commit()
             print(f"✓ Admin user created: {settings.ADMIN_EMAIL}")
         else:
@@ -54,13 +66,27 @@ def create_admin_user():
 async def lifespan(app: FastAPI):
     # Startup
     app_logger.info("Starting FastAPI application...")
-    Base.metadata.create_all(bind=engine)
-    app_logger.info("Database tables created")
+    # There is no baseline Alembic revision, so missing tables are created here
+    # (checkfirst: existing tables are left alone)
+    if settings.AUTO_CREATE_TABLES:
+        Base.metadata.create_all(bind=engine)
+        app_logger.info("Database tables created")
     create_admin_user()  # Create admin user on startup
+    if settings.ENVIRONMENT == "production":
+        ensure_partitions()  # Upcoming monthly api_analytics/logs partitions
+    analytics_task = asyncio.create_task(analytics_flusher())  # Batched analytics writer
     app_logger.info("Application startup complete")
     yield
     # Shutdown
-    pass
+    analytics_task.cancel()
+    try:
+        await analytics_task
+    except asyncio.CancelledError:
+        pass
+    await close_cache()
+    await email_service.pool.close()
+    await close_geolocation_client()
+    await cloudflare_service.aclose()
 
 
 # Initialize rate limiter
@@ -70,7 +96,8 @@ limiter = Limiter(key_func=get_remote_address)
 app = FastAPI(
     title=settings.APP_NAME,
     debug=settings.DEBUG,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add rate limiter to app state
@@ -86,44 +113,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add analytics middleware
-app.add_middleware(AnalyticsMiddleware)
+# Request logging and analytics middleware
+# (analytics recorded in production only; SQLite in development has a single writer)
+app.add_middleware(AnalyticsMiddleware, record_analytics=settings.ENVIRONMENT == "production")
 
-# Mount static files for uploads
+# Mount static files for uploads (disable SERVE_UPLOADS when a front server
+# such as nginx serves /uploads/ directly with sendfile)
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
-# Request logging middleware (lightweight, async-friendly)
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Log request (non-blocking)
-    api_logger.info(f"→ {request.method} {request.url.path}")
-    
-    try:
-        response = await call_next(request)
-        
-        # Log response (non-blocking)
-        duration = time.time() - start_time
-        api_logger.info(
-            f"← {request.method} {request.url.path} - {response.status_code} ({duration:.3f}s)"
-        )
-        
-        return response
-    except Exception as e:
-        # Log error (non-blocking)
-        duration = time.time() - start_time
-        api_logger.error(f"✗ {request.method} {request.url.path} - Error: {str(e)} ({duration:.3f}s)")
-        raise
-
+if settings.SERVE_UPLOADS:
+    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 # Exception handlers
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     log_error(exc, f"Unhandled exception in {request.url.path}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error"}
     )
@@ -144,22 +149,27 @@ async def health_check():
     return {"status": "healthy"}
 
 
-# Include routers
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(courses.router)
-app.include_router(enrollments.router)
-app.include_router(payments.router)
-app.include_router(admin.router)
-app.include_router(blogs.router)
-app.include_router(scorm.router)
-app.include_router(curriculum.router)
-app.include_router(cart_wishlist.router)
-app.include_router(coupons.router)
-app.include_router(logs.router, prefix="/api", tags=["logs"])
-app.include_router(analytics.router, prefix="/api", tags=["analytics"])
-app.include_router(sitemap.router, prefix="/api", tags=["seo"])
-app.include_router(branding.router)
+# Include routers: (router, prefix, tags)
+ROUTERS = [
+    (auth.router, None, None),
+    (users.router, None, None),
+    (courses.router, None, None),
+    (enrollments.router, None, None),
+    (payments.router, None, None),
+    (admin.router, None, None),
+    (blogs.router, None, None),
+    (scorm.router, None, None),
+    (curriculum.router, None, None),
+    (cart_wishlist.router, None, None),
+    (coupons.router, None, None),
+    (logs.router, "/api", ["logs"]),
+    (analytics.router, "/api", ["analytics"]),
+    (sitemap.router, "/api", ["seo"]),
+    (branding.router, None, None),
+]
+
+for router, prefix, tags in ROUTERS:
+    app.include_router(router, prefix=prefix or "", tags=tags)
 
 
 if __name__ == "__main__":
@@ -8,9 +8,9 @@ class APIAnalytics(Base):
     __tablename__ = "api_analytics"
     
     id = Column(Integer, primary_key=True, index=True)
-    endpoint = Column(String(255), nullable=False, index=True)  # e.g., "/api/auth/login"
-    method = Column(String(10), nullable=False, index=True)  # GET, POST, PUT, DELETE
-    status_code = Column(Integer, nullable=False, index=True)
+    endpoint = Column(String(255), nullable=False)  # e.g., "/api/auth/login"
+    method = Column(String(10), nullable=False)  # GET, POST, PUT, DELETE
+    status_code = Column(Integer, nullable=False)
     response_time_ms = Column(Float, nullable=False)  # Response time in milliseconds
     user_id = Column(Integer, nullable=True, index=True)  # User who made the request (if authenticated)
     ip_address = Column(String(45), nullable=True, index=True)  # IPv4 or IPv6
@@ -26,12 +26,19 @@ class APIAnalytics(Base):
     response_size = Column(Integer, nullable=True)  # Size in bytes
     error_message = Column(String(1000), nullable=True)  # Error details if failed
     extra_data = Column(JSON, nullable=True)  # Additional metadata
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
-    # Indexes for common queries
+    # Indexes for common queries (these also cover lookups on their leading
+    # column, so endpoint/status_code have no single-column index).
+    # On PostgreSQL the table is range-partitioned by month on created_at
+    # (see the partition_api_analytics migration), and created_at uses a BRIN
+    # index, which suits append-only time-ordered rows.
     __table_args__ = (
         Index('idx_endpoint_method', 'endpoint', 'method'),
-        Index('idx_created_at_endpoint', 'created_at', 'endpoint'),
+        Index(
+            'idx_api_analytics_created_at_brin', 'created_at',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ),
         Index('idx_status_created', 'status_code', 'created_at'),
     )
     
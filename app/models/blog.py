@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
@@ -22,3 +22,15 @@ class Blog(Base):
     
     # Relationships
     author = relationship("User", back_populates="blogs")
+
+    __table_args__ = (
+        # Trigram GIN indexes let blog ILIKE '%term%' search use an index (PostgreSQL only)
+        Index(
+            'ix_blogs_title_trgm', 'title',
+            postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_blogs_excerpt_trgm', 'excerpt',
+            postgresql_using='gin', postgresql_ops={'excerpt': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Enum
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy.sql import func
 import enum
 from ..core.database import Base
 
@@ -22,10 +22,10 @@ class Coupon(Base):
     usage_limit = Column(Integer, nullable=True)  # Total times coupon can be used
     usage_count = Column(Integer, default=0)  # Times coupon has been used
     is_active = Column(Boolean, default=True)
-    valid_from = Column(DateTime, default=datetime.utcnow)
+    valid_from = Column(DateTime, server_default=func.now())  # Naive, compared with datetime.utcnow()
     valid_until = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     creator_id = Column(Integer, nullable=True)  # Admin who created it
@@ -1,7 +1,11 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, JSON, Index, text, false
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from ..core.database import Base
+from ..core.database import Base, PASSIVE_DELETES
+
+# Stored as binary JSONB on PostgreSQL (no text reparse on read); plain JSON elsewhere
+JSONVariant = JSON().with_variant(JSONB(), "postgresql")
 
 
 class Course(Base):
@@ -28,12 +32,12 @@ class Course(Base):
     max_attempts = Column(Integer, nullable=True)  # Maximum attempts allowed
     
     # Sequencing and Navigation (SCORM 2004)
-    sequencing_rules = Column(JSON, nullable=True)  # JSON sequencing rules
-    navigation_controls = Column(JSON, nullable=True)  # Navigation settings
+    sequencing_rules = Column(JSONVariant, nullable=True)  # JSON sequencing rules
+    navigation_controls = Column(JSONVariant, nullable=True)  # Navigation settings
     
     # Completion Criteria
-    completion_criteria = Column(JSON, nullable=True)  # JSON completion rules
-    success_criteria = Column(JSON, nullable=True)  # JSON success rules
+    completion_criteria = Column(JSONVariant, nullable=True)  # JSON completion rules
+    success_criteria = Column(JSONVariant, nullable=True)  # JSON success rules
     
     # Creator
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -41,14 +45,28 @@ class Course(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Incremented in SQL by every UPDATE (ORM or bulk); keys the course list response cache
+    row_version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("row_version + 1"))
     
     # Relationships
     creator = relationship("User", back_populates="created_courses", foreign_keys=[creator_id])
-    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan")
-    sections = relationship("Section", back_populates="course", cascade="all, delete-orphan", order_by="Section.order")
-    lessons = relationship("Lesson", back_populates="course", cascade="all, delete-orphan")
+    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES)
+    sections = relationship("Section", back_populates="course", cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES, order_by="Section.order")
+    lessons = relationship("Lesson", back_populates="course", cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES)
     payments = relationship("Payment", back_populates="course")
-    scos = relationship("SCO", back_populates="course", cascade="all, delete-orphan")
+    scos = relationship("SCO", back_populates="course", cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES)
+
+    __table_args__ = (
+        # Trigram GIN indexes let the catalogue's ILIKE '%term%' search use an index (PostgreSQL only)
+        Index(
+            'ix_courses_title_trgm', 'title',
+            postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_courses_description_trgm', 'description',
+            postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
 
 
 class Section(Base):
@@ -56,7 +74,7 @@ class Section(Base):
     __tablename__ = "sections"
     
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     order = Column(Integer, default=0, nullable=False)
@@ -67,15 +85,16 @@ class Section(Base):
     
     # Relationships
     course = relationship("Course", back_populates="sections")
-    lessons = relationship("Lesson", back_populates="section", cascade="all, delete-orphan", order_by="Lesson.order")
+    # Every section response includes its lessons; load them for all sections in one query
+    lessons = relationship("Lesson", back_populates="section", cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES, order_by="Lesson.order", lazy="selectin")
 
 
 class Lesson(Base):
     __tablename__ = "lessons"
     
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    section_id = Column(Integer, ForeignKey("sections.id"), nullable=True)  # Optional section grouping
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    section_id = Column(Integer, ForeignKey("sections.id", ondelete="CASCADE"), nullable=True)  # Optional section grouping
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     
@@ -97,7 +116,7 @@ class Lesson(Base):
     is_preview = Column(Boolean, default=False)  # Can be viewed without enrollment
     
     # SCORM SCO Integration
-    sco_id = Column(Integer, ForeignKey("scos.id"), nullable=True)  # Link to SCORM SCO
+    sco_id = Column(Integer, ForeignKey("scos.id", ondelete="SET NULL"), nullable=True)  # Link to SCORM SCO
     is_scorm = Column(Boolean, default=False)  # Is this a SCORM lesson?
     
     # Timestamps
@@ -108,7 +127,7 @@ class Lesson(Base):
     course = relationship("Course", back_populates="lessons")
     section = relationship("Section", back_populates="lessons")
     sco = relationship("SCO", foreign_keys=[sco_id])
-    quiz = relationship("Quiz", back_populates="lesson", uselist=False, cascade="all, delete-orphan")
+    quiz = relationship("Quiz", back_populates="lesson", uselist=False, cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES)
 
 
 class Quiz(Base):
@@ -116,7 +135,7 @@ class Quiz(Base):
     __tablename__ = "quizzes"
     
     id = Column(Integer, primary_key=True, index=True)
-    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False, unique=True)
+    lesson_id = Column(Integer, ForeignKey("lessons.id", ondelete="CASCADE"), nullable=False, unique=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     
@@ -133,8 +152,8 @@ class Quiz(Base):
     
     # Relationships
     lesson = relationship("Lesson", back_populates="quiz")
-    questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan", order_by="QuizQuestion.order")
-    attempts = relationship("QuizAttempt", back_populates="quiz", cascade="all, delete-orphan")
+    questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES, order_by="QuizQuestion.order")
+    attempts = relationship("QuizAttempt", back_populates="quiz", cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES)
 
 
 class QuizQuestion(Base):
@@ -142,15 +161,15 @@ class QuizQuestion(Base):
     __tablename__ = "quiz_questions"
     
     id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
     question_text = Column(Text, nullable=False)
     question_type = Column(String(50), default="multiple_choice")  # multiple_choice, true_false, short_answer
     order = Column(Integer, default=0)
     points = Column(Float, default=1.0)
     
     # Options (for multiple choice/true-false)
-    options = Column(JSON, nullable=True)  # [{"id": "a", "text": "Option A"}, ...]
-    correct_answer = Column(JSON, nullable=False)  # ["a"] for single, ["a", "c"] for multiple, "true/false", or text
+    options = Column(JSONVariant, nullable=True)  # [{"id": "a", "text": "Option A"}, ...]
+    correct_answer = Column(JSONVariant, nullable=False)  # ["a"] for single, ["a", "c"] for multiple, "true/false", or text
     explanation = Column(Text, nullable=True)  # Explanation shown after answering
     
     # Timestamps
@@ -166,12 +185,12 @@ class QuizAttempt(Base):
     __tablename__ = "quiz_attempts"
     
     id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Attempt data
     attempt_number = Column(Integer, default=1)
-    answers = Column(JSON, nullable=False)  # {question_id: answer}
+    answers = Column(JSONVariant, nullable=False)  # {question_id: answer}
     score = Column(Float, nullable=True)  # Score achieved
     max_score = Column(Float, nullable=True)  # Maximum possible score
     percentage = Column(Float, nullable=True)  # Percentage score
@@ -192,7 +211,7 @@ class SCO(Base):
     __tablename__ = "scos"
     
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     
     # SCO Identifiers
     identifier = Column(String(255), nullable=False, unique=True)  # From manifest
@@ -220,7 +239,7 @@ class SCO(Base):
     
     # Relationships
     course = relationship("Course", back_populates="scos")
-    attempts = relationship("LearnerAttempt", back_populates="sco", cascade="all, delete-orphan")
+    attempts = relationship("LearnerAttempt", back_populates="sco", cascade="all, delete-orphan", passive_deletes=PASSIVE_DELETES)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -233,8 +252,8 @@ class LearnerAttempt(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    sco_id = Column(Integer, ForeignKey("scos.id"), nullable=False)
-    enrollment_id = Column(Integer, ForeignKey("enrollments.id"), nullable=False)
+    sco_id = Column(Integer, ForeignKey("scos.id", ondelete="CASCADE"), nullable=False)
+    enrollment_id = Column(Integer, ForeignKey("enrollments.id", ondelete="CASCADE"), nullable=False)
     
     # Attempt Tracking
     attempt_number = Column(Integer, default=1)
@@ -253,6 +272,7 @@ class LearnerAttempt(Base):
     
     # Location and Suspend Data
     location = Column(String(1000), nullable=True)  # Bookmark location
+    # suspend_data, interactions and objectives are TOAST-compressed with LZ4 on PostgreSQL 14+
     suspend_data = Column(Text, nullable=True)  # Serialized suspend data (max 64000 chars)
     
     # Entry and Exit
@@ -260,18 +280,21 @@ class LearnerAttempt(Base):
     exit_mode = Column(String(50), nullable=True)  # "time-out", "suspend", "logout", "normal", ""
     
     # Interactions (stored as JSON)
-    interactions = Column(JSON, nullable=True)  # Array of interaction data
+    interactions = Column(JSONVariant, nullable=True)  # Array of interaction data
     
     # Objectives (stored as JSON)
-    objectives = Column(JSON, nullable=True)  # Array of objective data
+    objectives = Column(JSONVariant, nullable=True)  # Array of objective data
     
     # Comments
-    comments_from_learner = Column(JSON, nullable=True)
-    comments_from_lms = Column(JSON, nullable=True)
+    comments_from_learner = Column(JSONVariant, nullable=True)
+    comments_from_lms = Column(JSONVariant, nullable=True)
     
     # Progress
     progress_measure = Column(Float, nullable=True)  # 0.0-1.0
     
+    # SetValue calls staged in Redis and not yet committed (Commit must then read them back)
+    has_staged_values = Column(Boolean, nullable=False, default=False, server_default=false())
+    
     # Timestamps
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     last_accessed_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -281,4 +304,13 @@ class LearnerAttempt(Base):
     user = relationship("User")
     sco = relationship("SCO", back_populates="attempts")
     enrollment = relationship("Enrollment")
+    
+    __table_args__ = (
+        # Latest-attempt lookups: filter by user and SCO, order by attempt number
+        Index('ix_learner_attempt_user_sco_num', 'user_id', 'sco_id', 'attempt_number'),
+        # Resumable-attempt lookup in scorm_initialize
+        Index('ix_learner_attempt_user_sco_status', 'user_id', 'sco_id', 'completion_status'),
+        # Course progress: attempts belonging to an enrollment
+        Index('ix_learner_attempt_enrollment', 'enrollment_id'),
+    )
 
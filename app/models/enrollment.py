@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
@@ -9,7 +9,8 @@ class Enrollment(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    payment_id = Column(Integer, ForeignKey("payments.id"), unique=True, nullable=True)  # Null for manual enrollments
     is_active = Column(Boolean, default=True)
     progress = Column(Float, default=0.0)  # Percentage completed (0-100)
     
@@ -20,3 +21,13 @@ class Enrollment(Base):
     # Relationships
     user = relationship("User", back_populates="enrollments")
     course = relationship("Course", back_populates="enrollments")
+    
+    __table_args__ = (
+        UniqueConstraint('user_id', 'course_id', name='uq_enrollment_user_course'),
+        # Partial index: only active enrollments, used by "my courses" lookups
+        Index(
+            'ix_enrollments_active_by_user', 'user_id',
+            postgresql_where=text('is_active'),
+            sqlite_where=text('is_active')
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from ..core.database import Base
 
@@ -7,14 +7,26 @@ class Log(Base):
     __tablename__ = "logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    level = Column(String(20), nullable=False, index=True)  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    level = Column(String(20), nullable=False)  # DEBUG, INFO, WARNING, ERROR, CRITICAL
     message = Column(Text, nullable=False)
     logger = Column(String(50), nullable=False)  # logger name (api, auth, db, etc.)
     module = Column(String(100))  # Python module
     function = Column(String(100))  # Function name
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     extra_data = Column(JSON, nullable=True)  # Additional context (endpoint, method, etc.)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # On PostgreSQL the table is range-partitioned by month on created_at
+    # (see the partition_logs migration); expired months are dropped whole.
+    __table_args__ = (
+        # BRIN suits append-only, time-ordered rows and is a tiny fraction of a B-tree's size
+        Index(
+            'ix_logs_created_at_brin', 'created_at',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ),
+        # Level filter with date range (admin log list, per-level counts and recent errors)
+        Index('ix_logs_level_created', 'level', 'created_at'),
+    )
 
     def __repr__(self):
         return f"<Log {self.level}: {self.message[:50]}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
@@ -14,7 +14,7 @@ class Payment(Base):
     # Payment details
     amount = Column(Float, nullable=False)
     currency = Column(String(10), default="USD")
-    status = Column(String(50), default="pending")  # pending, completed, failed, refunded
+    status = Column(String(50), default="pending", index=True)  # pending, completed, failed, refunded
     
     # Stripe specific
     stripe_payment_intent_id = Column(String(255), unique=True, nullable=True)
@@ -32,3 +32,10 @@ class Payment(Base):
     # Relationships
     user = relationship("User", back_populates="payments")
     course = relationship("Course", back_populates="payments")
+    
+    __table_args__ = (
+        # "My payments" and pending-checkout lookups filter by user and status
+        Index('ix_payment_user_status', 'user_id', 'status'),
+        # Per-course sales and revenue filter by course and status
+        Index('ix_payment_course_status', 'course_id', 'status'),
+    )
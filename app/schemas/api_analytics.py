@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
@@ -23,11 +23,15 @@ class APIAnalyticsResponse(BaseModel):
     request_size: Optional[int]
     response_size: Optional[int]
     error_message: Optional[str]
-    extra_data: Optional[Dict[str, Any]]
+    extra_data: Any  # Free-form JSON column
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_fast(cls, obj) -> "APIAnalyticsResponse":
+        """Build from a database row without validation (column types are already known)"""
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
 
 
 class APIAnalyticsFilter(BaseModel):
@@ -43,6 +47,8 @@ class APIAnalyticsFilter(BaseModel):
     limit: int = 100
     offset: int = 0
 
+    model_config = ConfigDict(defer_build=True)  # Not used by any route
+
 
 class EndpointStats(BaseModel):
     """Statistics for a specific endpoint"""
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional
 from datetime import datetime
 import re
@@ -14,7 +14,8 @@ class BlogBase(BaseModel):
 
 
 class BlogCreate(BlogBase):
-    @validator('title')
+    @field_validator('title')
+    @classmethod
     def validate_title(cls, v):
         if not v.strip():
             raise ValueError('Title cannot be empty')
@@ -35,8 +36,7 @@ class BlogAuthor(BaseModel):
     full_name: Optional[str]
     email: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BlogResponse(BlogBase):
@@ -48,15 +48,13 @@ class BlogResponse(BlogBase):
     created_at: datetime
     updated_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BlogWithAuthor(BlogResponse):
     author: BlogAuthor
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BlogListResponse(BaseModel):
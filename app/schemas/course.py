@@ -1,17 +1,21 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer
+from typing import Annotated, Optional, List, Any, Literal
 from datetime import datetime
+from decimal import Decimal
 
 
 # SCORM Schemas
+ScormType = Literal["sco", "asset"]
+
+
 class SCOBase(BaseModel):
     identifier: str
     title: str
     description: Optional[str] = None
     launch_url: str
-    scorm_type: str = "sco"  # "sco" or "asset"
+    scorm_type: ScormType = "sco"
     order_index: int = 0
-    prerequisites: Optional[Dict[str, Any]] = None
+    prerequisites: Any = None  # Manifest prerequisites JSON
     max_time_allowed: Optional[int] = None
     completion_threshold: Optional[float] = None
     min_normalized_measure: Optional[float] = None
@@ -22,6 +26,8 @@ class SCOBase(BaseModel):
 class SCOCreate(SCOBase):
     course_id: int
 
+    model_config = ConfigDict(defer_build=True)  # Not used by any route
+
 
 class SCOResponse(SCOBase):
     id: int
@@ -29,8 +35,7 @@ class SCOResponse(SCOBase):
     resource_identifier: Optional[str] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LearnerAttemptResponse(BaseModel):
@@ -47,15 +52,28 @@ class LearnerAttemptResponse(BaseModel):
     started_at: datetime
     completed_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Lesson Schemas
-class LessonBase(BaseModel):
+# Fixed set of lesson kinds; a Literal is a set-membership check in pydantic-core and
+# can serve as the discriminator if per-type lesson models are introduced
+LessonType = Literal["video", "text", "file", "scorm", "quiz"]
+
+
+class CloudflareVideoFields(BaseModel):
+    """Cloudflare Stream fields shared by lesson create/update/response schemas"""
+    cloudflare_stream_id: Optional[str] = None
+    cloudflare_video_uid: Optional[str] = None
+    video_status: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    video_duration_seconds: Optional[int] = None
+
+
+class LessonBase(CloudflareVideoFields):
     title: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
-    lesson_type: str = "video"  # video, text, file, scorm, quiz
+    lesson_type: LessonType = "video"
     video_url: Optional[str] = None
     content: Optional[str] = None  # For text lessons
     file_url: Optional[str] = None  # For file lessons
@@ -64,23 +82,16 @@ class LessonBase(BaseModel):
     is_preview: bool = False
     is_scorm: bool = False
     sco_id: Optional[int] = None
-    
-    # Cloudflare Stream fields
-    cloudflare_stream_id: Optional[str] = None
-    cloudflare_video_uid: Optional[str] = None
-    video_status: Optional[str] = None
-    thumbnail_url: Optional[str] = None
-    video_duration_seconds: Optional[int] = None
 
 
 class LessonCreate(LessonBase):
     section_id: Optional[int] = None
 
 
-class LessonUpdate(BaseModel):
+class LessonUpdate(CloudflareVideoFields):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
-    lesson_type: Optional[str] = None
+    lesson_type: Optional[LessonType] = None
     video_url: Optional[str] = None
     content: Optional[str] = None
     file_url: Optional[str] = None
@@ -90,13 +101,6 @@ class LessonUpdate(BaseModel):
     is_scorm: Optional[bool] = None
     sco_id: Optional[int] = None
     section_id: Optional[int] = None
-    
-    # Cloudflare Stream fields
-    cloudflare_stream_id: Optional[str] = None
-    cloudflare_video_uid: Optional[str] = None
-    video_status: Optional[str] = None
-    thumbnail_url: Optional[str] = None
-    video_duration_seconds: Optional[int] = None
 
 
 class LessonResponse(LessonBase):
@@ -105,20 +109,21 @@ class LessonResponse(LessonBase):
     section_id: Optional[int] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Course Schemas
-class CourseBase(BaseModel):
-    title: str = Field(..., min_length=1, max_length=255)
-    description: Optional[str] = None
-    price: float = Field(..., ge=0)
-    category: Optional[str] = None
-    thumbnail_url: Optional[str] = None
-    video_url: Optional[str] = None
-    
-    # SCORM fields
+# Submitted prices are exact to the cent (checked in pydantic-core, no rounding);
+# dumped as float for the Float price column
+Price = Annotated[
+    Decimal,
+    Field(ge=0, max_digits=10, decimal_places=2),
+    PlainSerializer(float, return_type=float)
+]
+
+
+class CourseScormFields(BaseModel):
+    """SCORM fields shared by course create/update/response schemas"""
     scorm_version: Optional[str] = None
     scorm_package_url: Optional[str] = None
     manifest_identifier: Optional[str] = None
@@ -127,44 +132,35 @@ class CourseBase(BaseModel):
     time_limit_minutes: Optional[int] = None
     launch_data: Optional[str] = None
     max_attempts: Optional[int] = None
-    sequencing_rules: Optional[Dict[str, Any]] = None
-    navigation_controls: Optional[Dict[str, Any]] = None
-    completion_criteria: Optional[Dict[str, Any]] = None
-    success_criteria: Optional[Dict[str, Any]] = None
+    # Opaque SCORM JSON stored as-is; Any skips per-key validation
+    sequencing_rules: Any = None
+    navigation_controls: Any = None
+    completion_criteria: Any = None
+    success_criteria: Any = None
+
+
+class CourseBase(CourseScormFields):
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    price: float = Field(..., ge=0)
+    category: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    video_url: Optional[str] = None
 
 
 class CourseCreate(CourseBase):
+    price: Price
     is_published: bool = False
-    
-    @validator('price')
-    def validate_price(cls, v):
-        if v < 0:
-            raise ValueError('Price cannot be negative')
-        return round(v, 2)
 
 
-class CourseUpdate(BaseModel):
+class CourseUpdate(CourseScormFields):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
-    price: Optional[float] = Field(None, ge=0)
+    price: Optional[Price] = None
     category: Optional[str] = None
     thumbnail_url: Optional[str] = None
     video_url: Optional[str] = None
     is_published: Optional[bool] = None
-    
-    # SCORM fields
-    scorm_version: Optional[str] = None
-    scorm_package_url: Optional[str] = None
-    manifest_identifier: Optional[str] = None
-    mastery_score: Optional[float] = None
-    completion_threshold: Optional[float] = None
-    time_limit_minutes: Optional[int] = None
-    launch_data: Optional[str] = None
-    max_attempts: Optional[int] = None
-    sequencing_rules: Optional[Dict[str, Any]] = None
-    navigation_controls: Optional[Dict[str, Any]] = None
-    completion_criteria: Optional[Dict[str, Any]] = None
-    success_criteria: Optional[Dict[str, Any]] = None
 
 
 class CourseResponse(CourseBase):
@@ -175,17 +171,15 @@ class CourseResponse(CourseBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CourseDetailResponse(CourseResponse):
-    sections: List[SectionResponse] = []
+    sections: List["SectionResponse"] = []  # Defined below; resolved by model_rebuild()
     lessons: List[LessonResponse] = []
     scos: List[SCOResponse] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CourseListResponse(BaseModel):
@@ -218,8 +212,10 @@ class SectionResponse(SectionBase):
     created_at: datetime
     lessons: List[LessonResponse] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+CourseDetailResponse.model_rebuild()
 
 
 # Quiz Schemas
@@ -228,9 +224,12 @@ class QuizQuestionOption(BaseModel):
     text: str
 
 
+QuestionType = Literal["multiple_choice", "true_false", "short_answer"]
+
+
 class QuizQuestionBase(BaseModel):
     question_text: str
-    question_type: str = "multiple_choice"  # multiple_choice, true_false, short_answer
+    question_type: QuestionType = "multiple_choice"
     order: int = 0
     points: float = 1.0
     options: Optional[List[QuizQuestionOption]] = None
@@ -244,7 +243,7 @@ class QuizQuestionCreate(QuizQuestionBase):
 
 class QuizQuestionUpdate(BaseModel):
     question_text: Optional[str] = None
-    question_type: Optional[str] = None
+    question_type: Optional[QuestionType] = None
     order: Optional[int] = None
     points: Optional[float] = None
     options: Optional[List[QuizQuestionOption]] = None
@@ -257,8 +256,7 @@ class QuizQuestionResponse(QuizQuestionBase):
     quiz_id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class QuizBase(BaseModel):
@@ -292,12 +290,18 @@ class QuizResponse(QuizBase):
     created_at: datetime
     questions: List[QuizQuestionResponse] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class QuizAnswer(BaseModel):
+    question_id: int
+    value: Any  # Option id(s), true/false or free text, depending on question type
 
 
 class QuizAttemptCreate(BaseModel):
-    answers: Dict[int, Any]  # {question_id: answer}
+    # A list rather than a {question_id: answer} object: JSON object keys are strings
+    # and would each be parsed back to int
+    answers: List[QuizAnswer]
 
 
 class QuizAttemptResponse(BaseModel):
@@ -305,7 +309,7 @@ class QuizAttemptResponse(BaseModel):
     quiz_id: int
     user_id: int
     attempt_number: int
-    answers: Dict[int, Any]
+    answers: Any  # Stored JSON; keys serialize as strings either way
     score: Optional[float] = None
     max_score: Optional[float] = None
     percentage: Optional[float] = None
@@ -314,5 +318,4 @@ class QuizAttemptResponse(BaseModel):
     started_at: datetime
     submitted_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
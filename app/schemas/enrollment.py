@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 from .course import CourseResponse
@@ -21,15 +21,13 @@ class EnrollmentResponse(BaseModel):
     enrolled_at: datetime
     last_accessed: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EnrollmentWithCourse(EnrollmentResponse):
     course: CourseResponse
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EnrollmentStatsResponse(BaseModel):
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Any
+from enum import Enum
 
 
 class LogBase(BaseModel):
@@ -10,19 +11,37 @@ class LogBase(BaseModel):
     module: Optional[str] = None
     function: Optional[str] = None
     user_id: Optional[int] = None
-    extra_data: Optional[Dict[str, Any]] = None
+    extra_data: Any = None  # Free-form JSON context, kept as-is
 
 
 class LogCreate(LogBase):
-    pass
+    model_config = ConfigDict(defer_build=True)  # Not used by any route
 
 
 class LogResponse(LogBase):
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LogSummaryResponse(BaseModel):
+    """Log list row without the heavy extra_data payload."""
+    id: int
+    level: str
+    message: str
+    logger: str
+    module: Optional[str] = None
+    function: Optional[str] = None
+    user_id: Optional[int] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_fast(cls, obj) -> "LogSummaryResponse":
+        """Build from a database row without validation (column types are already known)"""
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
 
 
 class LogFilter(BaseModel):
@@ -33,3 +52,13 @@ class LogFilter(BaseModel):
     end_date: Optional[datetime] = None
     limit: int = 100
     offset: int = 0
+
+    model_config = ConfigDict(defer_build=True)  # Not used by any route
+
+
+class LogType(str, Enum):
+    APP = "app"
+    API = "api"
+    DATABASE = "database"
+    AUTH = "auth"
+    ERROR = "error"
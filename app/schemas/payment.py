@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Optional
 from datetime import datetime
 
 
@@ -37,8 +37,7 @@ class PaymentResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PaymentStatsResponse(BaseModel):
@@ -51,4 +50,6 @@ class PaymentStatsResponse(BaseModel):
 
 class WebhookEvent(BaseModel):
     type: str
-    data: dict
+    data: Any  # Raw Stripe event object
+
+    model_config = ConfigDict(defer_build=True)  # Not used by any route
@@ -1,32 +1,60 @@
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, Field, StringConstraints, field_validator
+from typing import Annotated, Optional
 from datetime import datetime
 
+from ..core.validation import password_strength_error, url_error
+
+
+def check_url(url: str) -> str:
+    error = url_error(url)
+    if error:
+        raise ValueError(error)
+    return url
+
+
+def check_password_strength(password: str) -> str:
+    error = password_strength_error(password)
+    if error:
+        raise ValueError(error)
+    return password
+
+
+# Constrained input types; pydantic-core checks these while parsing the request body
+LowercaseEmail = Annotated[EmailStr, AfterValidator(str.lower)]
+FullName = Annotated[str, StringConstraints(
+    strip_whitespace=True, min_length=2, max_length=255, pattern=r"^[a-zA-Z\s'\-]+$"
+)]
+ResetToken = Annotated[str, StringConstraints(
+    strip_whitespace=True, min_length=1, pattern=r"^[a-zA-Z0-9\-]+$"
+)]
+OAuthId = Annotated[str, StringConstraints(
+    strip_whitespace=True, min_length=1, max_length=255, pattern=r"^[a-zA-Z0-9\-_.]+$"
+)]
+HttpsUrl = Annotated[str, StringConstraints(strip_whitespace=True, max_length=500), AfterValidator(check_url)]
+
 
 # User Schemas
 class UserBase(BaseModel):
-    email: EmailStr
+    email: LowercaseEmail
     full_name: Optional[str] = None
 
 
 class UserCreate(UserBase):
+    full_name: FullName
     password: str = Field(..., min_length=8, max_length=100)
     
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
-        if not any(char.isdigit() for char in v):
-            raise ValueError('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        return v
+        return check_password_strength(v)
 
 
 class OAuthUserCreate(BaseModel):
-    email: EmailStr
-    full_name: Optional[str] = None
+    email: LowercaseEmail
+    full_name: FullName
     oauth_provider: str  # google, linkedin
-    oauth_id: str
-    avatar_url: Optional[str] = None
+    oauth_id: OAuthId
+    avatar_url: Optional[HttpsUrl] = None
 
 
 class UserUpdate(BaseModel):
@@ -35,7 +63,7 @@ class UserUpdate(BaseModel):
 
 
 class UserLogin(BaseModel):
-    email: EmailStr
+    email: LowercaseEmail
     password: str
 
 
@@ -47,17 +75,21 @@ class UserResponse(UserBase):
     oauth_provider: Optional[str] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PasswordResetRequest(BaseModel):
-    email: EmailStr
+    email: LowercaseEmail
 
 
 class PasswordReset(BaseModel):
-    token: str
+    token: ResetToken
     new_password: str = Field(..., min_length=8, max_length=100)
+    
+    @field_validator('new_password')
+    @classmethod
+    def validate_password(cls, v):
+        return check_password_strength(v)
 
 
 class TokenResponse(BaseModel):
@@ -75,10 +107,7 @@ class PasswordChange(BaseModel):
     old_password: str
     new_password: str = Field(..., min_length=8, max_length=100)
     
-    @validator('new_password')
+    @field_validator('new_password')
+    @classmethod
     def validate_password(cls, v):
-        if not any(char.isdigit() for char in v):
-            raise ValueError('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        return v
+        return check_password_strength(v)
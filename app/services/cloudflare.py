@@ -2,10 +2,11 @@
 Cloudflare Stream and R2 Storage Integration Service
 Handles video uploads to Cloudflare Stream for streaming and R2 for backup storage
 """
+import asyncio
 import httpx
 import boto3
 from botocore.exceptions import ClientError
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, BinaryIO
 import logging
 from pathlib import Path
 import uuid
@@ -22,6 +23,12 @@ class CloudflareService:
         self.account_id = settings.CLOUDFLARE_ACCOUNT_ID
         self.api_token = settings.CLOUDFLARE_API_TOKEN
         self.stream_api_base = f"https://api.cloudflare.com/client/v4/accounts/{self.account_id}/stream"
+        # Per-video thumbnail/preview URLs only differ by video UID
+        self._thumbnail_url = f"https://customer-{self.account_id}.cloudflarestream.com/{{uid}}/thumbnails/thumbnail.jpg".format
+        self._preview_url = f"https://customer-{self.account_id}.cloudflarestream.com/{{uid}}/watch".format
+        
+        # Shared HTTP client so Stream API calls reuse pooled keep-alive connections
+        self._client: Optional[httpx.AsyncClient] = None
         
         # Initialize R2 client (S3-compatible)
         self.r2_client = None
@@ -37,9 +44,24 @@ class CloudflareService:
             except Exception as e:
                 logger.error(f"Failed to initialize R2 client: {str(e)}")
     
+    def _get_client(self) -> httpx.AsyncClient:
+        # Auth headers stay per request: the upload URL is a different, pre-signed host
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def upload_video_to_stream(
         self,
-        file_content: bytes,
+        file: BinaryIO,
         filename: str,
         metadata: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
@@ -47,7 +69,7 @@ class CloudflareService:
         Upload video directly to Cloudflare Stream via Direct Creator Upload
         
         Args:
-            file_content: Video file content as bytes
+            file: Open video file, streamed from its current position in chunks
             filename: Original filename
             metadata: Optional metadata for the video
             
@@ -59,48 +81,49 @@ class CloudflareService:
         
         try:
             # Step 1: Create a Direct Creator Upload URL
-            async with httpx.AsyncClient() as client:
-                # Request upload URL
-                create_response = await client.post(
-                    f"{self.stream_api_base}/direct_upload",
-                    headers={
-                        "Authorization": f"Bearer {self.api_token}",
-                    },
-                    json={
-                        "maxDurationSeconds": 21600,  # 6 hours max
-                        "requireSignedURLs": False,  # Set to True for private videos
-                        "meta": metadata or {"name": filename}
-                    }
-                )
-                create_response.raise_for_status()
-                upload_data = create_response.json()
-                
-                if not upload_data.get("success"):
-                    raise Exception(f"Failed to create upload URL: {upload_data.get('errors')}")
-                
-                result = upload_data["result"]
-                upload_url = result["uploadURL"]
-                video_uid = result["uid"]
-                
-                # Step 2: Upload the actual video file
-                upload_response = await client.post(
-                    upload_url,
-                    files={
-                        "file": (filename, file_content, "video/mp4")
-                    }
-                )
-                upload_response.raise_for_status()
-                
-                logger.info(f"Video uploaded to Stream successfully: {video_uid}")
-                
-                return {
-                    "uid": video_uid,
-                    "status": "pending",  # Will be "ready" once encoding completes
-                    "thumbnail": f"https://customer-{self.account_id}.cloudflarestream.com/{video_uid}/thumbnails/thumbnail.jpg",
-                    "preview": f"https://customer-{self.account_id}.cloudflarestream.com/{video_uid}/watch",
-                    "embed_code": result.get("embedCode", ""),
+            client = self._get_client()
+            # Request upload URL
+            create_response = await client.post(
+                f"{self.stream_api_base}/direct_upload",
+                headers={
+                    "Authorization": f"Bearer {self.api_token}",
+                },
+                json={
+                    "maxDurationSeconds": 21600,  # 6 hours max
+                    "requireSignedURLs": False,  # Set to True for private videos
+                    "meta": metadata or {"name": filename}
                 }
-                
+            )
+            create_response.raise_for_status()
+            upload_data = create_response.json()
+            
+            if not upload_data.get("success"):
+                raise Exception(f"Failed to create upload URL: {upload_data.get('errors')}")
+            
+            result = upload_data["result"]
+            upload_url = result["uploadURL"]
+            video_uid = result["uid"]
+            
+            # Step 2: Upload the actual video file; httpx streams a file object in
+            # chunks instead of holding the whole video in memory
+            upload_response = await client.post(
+                upload_url,
+                files={
+                    "file": (filename, file, "video/mp4")
+                }
+            )
+            upload_response.raise_for_status()
+            
+            logger.info(f"Video uploaded to Stream successfully: {video_uid}")
+            
+            return {
+                "uid": video_uid,
+                "status": "pending",  # Will be "ready" once encoding completes
+                "thumbnail": self._thumbnail_url(uid=video_uid),
+                "preview": self._preview_url(uid=video_uid),
+                "embed_code": result.get("embedCode", ""),
+            }
+            
         except httpx.HTTPError as e:
             logger.error(f"HTTP error uploading to Stream: {str(e)}")
             raise Exception(f"Failed to upload video to Cloudflare Stream: {str(e)}")
@@ -119,27 +142,27 @@ class CloudflareService:
             Dict with video status, duration, thumbnail, etc.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.stream_api_base}/{video_uid}",
-                    headers={"Authorization": f"Bearer {self.api_token}"}
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = self._get_client()
+            response = await client.get(
+                f"{self.stream_api_base}/{video_uid}",
+                headers={"Authorization": f"Bearer {self.api_token}"}
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get("success"):
+                result = data["result"]
+                return {
+                    "uid": result.get("uid"),
+                    "status": result.get("status", {}).get("state", "unknown"),
+                    "duration": result.get("duration"),
+                    "thumbnail": result.get("thumbnail"),
+                    "preview": result.get("preview"),
+                    "playback": result.get("playback"),
+                }
+            else:
+                raise Exception(f"Failed to get video details: {data.get('errors')}")
                 
-                if data.get("success"):
-                    result = data["result"]
-                    return {
-                        "uid": result.get("uid"),
-                        "status": result.get("status", {}).get("state", "unknown"),
-                        "duration": result.get("duration"),
-                        "thumbnail": result.get("thumbnail"),
-                        "preview": result.get("preview"),
-                        "playback": result.get("playback"),
-                    }
-                else:
-                    raise Exception(f"Failed to get video details: {data.get('errors')}")
-                    
         except Exception as e:
             logger.error(f"Error getting video details: {str(e)}")
             raise
@@ -155,21 +178,21 @@ class CloudflareService:
             True if successful
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.stream_api_base}/{video_uid}",
-                    headers={"Authorization": f"Bearer {self.api_token}"}
-                )
-                response.raise_for_status()
-                return True
-                
+            client = self._get_client()
+            response = await client.delete(
+                f"{self.stream_api_base}/{video_uid}",
+                headers={"Authorization": f"Bearer {self.api_token}"}
+            )
+            response.raise_for_status()
+            return True
+            
         except Exception as e:
             logger.error(f"Error deleting video from Stream: {str(e)}")
             return False
     
-    def upload_to_r2(
+    async def upload_to_r2(
         self,
-        file_content: bytes,
+        file: BinaryIO,
         filename: str,
         content_type: str = "video/mp4"
     ) -> Optional[str]:
@@ -177,7 +200,7 @@ class CloudflareService:
         Upload file to Cloudflare R2 storage (backup/alternative storage)
         
         Args:
-            file_content: File content as bytes
+            file: Open file, streamed from its current position (multipart for large files)
             filename: Destination filename in R2
             content_type: MIME type of the file
             
@@ -193,12 +216,13 @@ class CloudflareService:
             file_ext = Path(filename).suffix
             unique_filename = f"videos/{uuid.uuid4()}{file_ext}"
             
-            # Upload to R2
-            self.r2_client.put_object(
-                Bucket=settings.CLOUDFLARE_R2_BUCKET_NAME,
-                Key=unique_filename,
-                Body=file_content,
-                ContentType=content_type
+            # Upload to R2; boto3 blocks, so it runs in a worker thread
+            await asyncio.to_thread(
+                self.r2_client.upload_fileobj,
+                file,
+                settings.CLOUDFLARE_R2_BUCKET_NAME,
+                unique_filename,
+                ExtraArgs={"ContentType": content_type}
             )
             
             # Generate public URL (adjust based on your R2 public URL setup)
@@ -214,7 +238,7 @@ class CloudflareService:
             logger.error(f"Unexpected error uploading to R2: {str(e)}")
             return None
     
-    def delete_from_r2(self, file_key: str) -> bool:
+    async def delete_from_r2(self, file_key: str) -> bool:
         """
         Delete a file from R2 storage
         
@@ -228,7 +252,8 @@ class CloudflareService:
             return False
         
         try:
-            self.r2_client.delete_object(
+            await asyncio.to_thread(
+                self.r2_client.delete_object,
                 Bucket=settings.CLOUDFLARE_R2_BUCKET_NAME,
                 Key=file_key
             )
@@ -8,7 +8,12 @@ from app.models import Section, Quiz, QuizQuestion, QuizAttempt
 
 def migrate():
     print("Creating new tables...")
-    Base.metadata.create_all(bind=engine)
+    # Only the curriculum tables; checkfirst skips any that already exist
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Section.__table__, Quiz.__table__, QuizQuestion.__table__, QuizAttempt.__table__],
+        checkfirst=True
+    )
     print("✓ Migration complete!")
     print("New tables created:")
     print("  - sections")
@@ -5,52 +5,46 @@ All data will be lost. Use only for development.
 Run this to update the database schema after model changes.
 """
 
-import os
-from app.core.database import engine, Base, SessionLocal
+from sqlalchemy import insert
+from app.core.database import engine, Base
 from app.core.security import get_password_hash
 from app.core.config import settings
 from app.models import User, Course, Lesson, Section, Quiz, QuizQuestion, QuizAttempt, SCO, LearnerAttempt, Enrollment, Payment, Blog
 
 def reset_database():
-    # Get database path
-    db_path = "lms.db"
-    
     print("⚠️  WARNING: This will delete all data in the database!")
-    print(f"Database location: {os.path.abspath(db_path)}")
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
     
     response = input("Are you sure you want to continue? (yes/no): ")
     if response.lower() != 'yes':
         print("❌ Operation cancelled")
         return
     
-    # Delete existing database
-    if os.path.exists(db_path):
-        os.remove(db_path)
-        print(f"✓ Deleted existing database: {db_path}")
-    
-    # Create all tables with new schema
-    print("Creating new database tables...")
-    Base.metadata.create_all(bind=engine)
+    # Drop and recreate every table in one transaction; works for any backend,
+    # not just a local SQLite file
+    print("Recreating database tables...")
+    with engine.begin() as conn:
+        Base.metadata.drop_all(bind=conn)
+        Base.metadata.create_all(bind=conn)
     print("✓ Database tables created successfully!")
     
-    # Recreate admin user
-    db = SessionLocal()
+    # Recreate admin user. Seed rows go through a Core executemany insert in one
+    # transaction (no ORM flush or identity map); append more dicts to seed more rows
+    seed_users = [
+        {
+            "email": settings.ADMIN_EMAIL,
+            "full_name": settings.ADMIN_FULL_NAME,
+            "hashed_password": get_password_hash(settings.ADMIN_PASSWORD),
+            "role": "admin",
+            "is_active": True
+        }
+    ]
     try:
-        admin_user = User(
-            email=settings.ADMIN_EMAIL,
-            full_name=settings.ADMIN_FULL_NAME,
-            hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
-            role="admin",
-            is_active=True
-        )
-        db.add(admin_user)
-        db.commit()
+        with engine.begin() as conn:
+            conn.execute(insert(User), seed_users)
         print(f"✓ Admin user created: {settings.ADMIN_EMAIL}")
     except Exception as e:
         print(f"❌ Error creating admin user: {e}")
-        db.rollback()
-    finally:
-        db.close()
     
     print("\n✅ Database reset complete!")
     print("Tables created:")
@@ -0,0 +1,14 @@
+import pytest
+
+from app.core.analytics_middleware import _geolocate_batch
+
+
+@pytest.mark.asyncio
+async def test_private_ip_records_local_geolocation():
+    # Private IPs resolve to the read-only LOCAL_GEOLOCATION mapping without a lookup
+    [record] = await _geolocate_batch([{"ip_address": "192.168.1.10"}])
+
+    assert record["country"] == "Local"
+    assert record["country_code"] == "LOCAL"
+    assert record["city"] == "Local"
+    assert record["timezone"] == "UTC"